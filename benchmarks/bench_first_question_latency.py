@@ -0,0 +1,106 @@
+"""
+Measure the latency until interactive research returns its first clarifying question.
+
+Starts interactive research workflows with update-with-start and times the
+start_research update, which returns once the triage and clarifying agents
+have run. Runs alternate between regular activities and local activities for
+those agents so both modes see the same worker and provider conditions.
+
+Requires a running Temporal server and worker (``uv run pydantic_demos/run_worker.py``).
+Reports the p50 and p95 latency of each mode; use at least 20 runs for a
+meaningful p95.
+
+Usage:
+    uv run benchmarks/bench_first_question_latency.py --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
+from temporalio.client import Client, WithStartWorkflowOperation
+from temporalio.common import WorkflowIDConflictPolicy
+
+from pydantic_demos.data_converter import DataConverterPlugin
+from pydantic_demos.workflows.interactive_research_workflow import (
+    PydanticInteractiveResearchWorkflow,
+)
+from pydantic_demos.workflows.research_agents.research_models import (
+    ResearchConfig,
+    UserQueryInput,
+)
+
+MODES = {
+    "activities": ResearchConfig(local_activity_agents=[]),
+    "local activities": ResearchConfig(
+        local_activity_agents=["triage-agent", "clarifying-agent"]
+    ),
+}
+
+
+async def time_first_question(
+    client: Client, query: str, config: ResearchConfig
+) -> float:
+    """Seconds from starting a workflow until start_research returns its questions"""
+    start_op = WithStartWorkflowOperation(
+        PydanticInteractiveResearchWorkflow.run,
+        args=[None, False, config],
+        id=f"bench-first-question-{uuid.uuid4()}",
+        task_queue="pydantic-ai-task-queue",
+        id_conflict_policy=WorkflowIDConflictPolicy.FAIL,
+    )
+    started = time.perf_counter()
+    status = await client.execute_update_with_start_workflow(
+        PydanticInteractiveResearchWorkflow.start_research,
+        UserQueryInput(query=query),
+        start_workflow_operation=start_op,
+    )
+    elapsed = time.perf_counter() - started
+
+    if not status.clarification_questions:
+        print("  warning: triage asked no questions; try a vaguer --query")
+    handle = await start_op.workflow_handle()
+    await handle.signal(PydanticInteractiveResearchWorkflow.end_workflow_signal)
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="Workflows per mode")
+    parser.add_argument(
+        "--query",
+        default="best restaurants in Melbourne",
+        help="A query vague enough for triage to ask clarifying questions",
+    )
+    args = parser.parse_args()
+
+    client = await Client.connect(
+        "localhost:7233",
+        plugins=[PydanticAIPlugin(), DataConverterPlugin()],
+    )
+
+    timings: dict[str, list[float]] = {mode: [] for mode in MODES}
+    for run in range(args.runs):
+        for mode, config in MODES.items():
+            elapsed = await time_first_question(client, args.query, config)
+            timings[mode].append(elapsed)
+            print(f"run {run + 1:>3} {mode:<17} {elapsed:6.2f}s")
+
+    print(f"\n{'mode':<17} {'runs':>5} {'p50':>8} {'p95':>8} {'mean':>8}")
+    for mode, samples in timings.items():
+        p95 = (
+            statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+        )
+        print(
+            f"{mode:<17} {len(samples):>5} {statistics.median(samples):>7.2f}s "
+            f"{p95:>7.2f}s {statistics.mean(samples):>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
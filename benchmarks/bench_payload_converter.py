@@ -0,0 +1,145 @@
+"""
+Compare Temporal's Pydantic payload converter with FastPydanticPayloadConverter.
+
+Encodes and decodes report-sized workflow inputs and results, reporting
+throughput and peak allocation for each converter. The types are imported
+outside the workflow sandbox, so every decode can reuse a cached adapter;
+inside the sandbox the first decode of each type per workflow run builds one.
+
+Usage:
+    uv run benchmarks/bench_payload_converter.py --iterations 2000
+
+Importing the research agents needs ``OPENAI_API_KEY`` to be set, but no
+model requests are made.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from temporalio.contrib.pydantic import PydanticPayloadConverter
+from temporalio.converter import PayloadConverter
+
+from pydantic_demos.data_converter import FastPydanticPayloadConverter
+from pydantic_demos.workflows.interactive_research_workflow import (
+    InteractiveResearchResult,
+)
+from pydantic_demos.workflows.research_agents.planner_agent import (
+    WebSearchItem,
+    WebSearchPlan,
+)
+from pydantic_demos.workflows.research_agents.research_models import (
+    ResearchInteractionDict,
+    ResearchMetrics,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import ReportData
+
+PARAGRAPH = (
+    "Quantum error correction encodes a logical qubit across many physical "
+    "qubits so that errors can be detected and corrected without measuring "
+    "the encoded state directly. Recent surface code experiments show logical "
+    "error rates falling as the code distance grows. "
+)
+
+
+def _markdown_report(sections: int = 12, paragraphs: int = 6) -> str:
+    parts = ["# Quantum Computing in 2025"]
+    for section in range(sections):
+        parts.append(f"## Section {section + 1}")
+        parts.extend(PARAGRAPH * 3 for _ in range(paragraphs))
+    return "\n\n".join(parts)
+
+
+def sample_values() -> dict[str, tuple[Any, type]]:
+    """Realistic values for each workflow I/O type, keyed by name"""
+    report = ReportData(
+        short_summary=PARAGRAPH,
+        markdown_report=_markdown_report(),
+        follow_up_questions=[f"Follow-up question {i}?" for i in range(5)],
+    )
+    plan = WebSearchPlan(
+        searches=[
+            WebSearchItem(reason=PARAGRAPH, query=f"quantum computing topic {i}")
+            for i in range(20)
+        ]
+    )
+    interaction = ResearchInteractionDict(
+        original_query="Tell me about quantum computing",
+        clarification_questions=[f"Clarifying question {i}?" for i in range(3)],
+        clarification_responses={f"question_{i}": PARAGRAPH for i in range(3)},
+        current_question_index=3,
+        status="completed",
+        research_completed=True,
+        final_result=report.markdown_report,
+    )
+    result = InteractiveResearchResult(
+        short_summary=report.short_summary,
+        markdown_report=report.markdown_report,
+        follow_up_questions=report.follow_up_questions,
+        pdf_file_path="pdf_output/research_report_0123456789abcdef.pdf",
+        metrics=ResearchMetrics(searches_planned=20, searches_completed=20),
+    )
+    return {
+        "ReportData": (report, ReportData),
+        "WebSearchPlan": (plan, WebSearchPlan),
+        "ResearchInteractionDict": (interaction, ResearchInteractionDict),
+        "InteractiveResearchResult": (result, InteractiveResearchResult),
+    }
+
+
+def _measure(fn: Callable[[], Any], iterations: int) -> tuple[float, int]:
+    """Return operations per second and peak bytes allocated by one call"""
+    fn()
+    seconds = timeit.timeit(fn, number=iterations)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return iterations / seconds, peak
+
+
+def run(iterations: int) -> None:
+    converters: dict[str, PayloadConverter] = {
+        "contrib.pydantic": PydanticPayloadConverter(),
+        "fast": FastPydanticPayloadConverter(),
+    }
+    print(
+        f"{'type':<26} {'converter':<17} {'bytes':>8} "
+        f"{'encode/s':>10} {'decode/s':>10} {'enc peak':>9} {'dec peak':>9}"
+    )
+    for name, (value, type_hint) in sample_values().items():
+        for converter_name, converter in converters.items():
+            payloads = converter.to_payloads([value])
+            decoded = converter.from_payloads(payloads, [type_hint])
+            assert decoded[0] == value, f"{converter_name} round trip changed {name}"
+
+            encode_rate, encode_peak = _measure(
+                lambda: converter.to_payloads([value]), iterations
+            )
+            decode_rate, decode_peak = _measure(
+                lambda: converter.from_payloads(payloads, [type_hint]), iterations
+            )
+            print(
+                f"{name:<26} {converter_name:<17} {len(payloads[0].data):>8} "
+                f"{encode_rate:>10.0f} {decode_rate:>10.0f} "
+                f"{encode_peak:>9} {decode_peak:>9}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=2000,
+        help="Encode and decode calls timed per type and converter",
+    )
+    args = parser.parse_args()
+    run(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Data conversion shared by the demo clients and worker.
+
+``DataConverterPlugin`` must come after ``PydanticAIPlugin`` in the
+``plugins`` list so it replaces the Pydantic data converter that plugin
+installs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from temporalio.api.common.v1 import Payload
+from temporalio.client import ClientConfig
+from temporalio.client import Plugin as ClientPlugin
+from temporalio.converter import (
+    CompositePayloadConverter,
+    DefaultPayloadConverter,
+    EncodingPayloadConverter,
+    JSONPlainPayloadConverter,
+    PayloadCodec,
+)
+
+BLOB_REF_ENCODING = b"binary/blob-ref"
+ZLIB_ENCODING = b"binary/zlib"
+
+
+_TYPE_ADAPTER_CACHE_SIZE = 512
+_type_adapters: OrderedDict[str, tuple[Any, TypeAdapter[Any]]] = OrderedDict()
+_type_adapters_lock = threading.Lock()
+
+
+def _type_key(type_hint: Any) -> str:
+    if isinstance(type_hint, type):
+        return f"{type_hint.__module__}.{type_hint.__qualname__}"
+    return repr(type_hint)
+
+
+def _type_adapter(type_hint: Any) -> TypeAdapter[Any]:
+    """
+    Get a ``TypeAdapter`` for a type hint, reusing a cached one when possible.
+
+    The workflow sandbox re-imports workflow modules for every run, so the same
+    model arrives as a new class object each time. Adapters are keyed by the
+    type's stable name and only reused for the identical type; a re-imported
+    type replaces the previous entry instead of keeping the old sandbox's
+    modules alive next to it.
+    """
+    key = _type_key(type_hint)
+    with _type_adapters_lock:
+        cached = _type_adapters.get(key)
+        if cached is not None and cached[0] == type_hint:
+            _type_adapters.move_to_end(key)
+            return cached[1]
+
+    adapter = TypeAdapter(type_hint)
+    with _type_adapters_lock:
+        _type_adapters[key] = (type_hint, adapter)
+        _type_adapters.move_to_end(key)
+        if len(_type_adapters) > _TYPE_ADAPTER_CACHE_SIZE:
+            _type_adapters.popitem(last=False)
+    return adapter
+
+
+class FastPydanticJSONPayloadConverter(EncodingPayloadConverter):
+    """
+    JSON payload converter for Pydantic models and dataclasses.
+
+    Produces the same ``json/plain`` payloads as Temporal's Pydantic converter,
+    but serializes models straight to bytes with their compiled serializer and
+    reuses one ``TypeAdapter`` per type hint instead of building a new one for
+    every decoded payload.
+    """
+
+    @property
+    def encoding(self) -> str:
+        return "json/plain"
+
+    def to_payload(self, value: Any) -> Optional[Payload]:
+        if isinstance(value, BaseModel):
+            data = value.__pydantic_serializer__.to_json(value, by_alias=True)
+        else:
+            data = to_json(value)
+        return Payload(metadata={"encoding": b"json/plain"}, data=data)
+
+    def from_payload(self, payload: Payload, type_hint: Optional[type] = None) -> Any:
+        return _type_adapter(Any if type_hint is None else type_hint).validate_json(
+            payload.data
+        )
+
+
+class FastPydanticPayloadConverter(CompositePayloadConverter):
+    """Default payload converters with JSON handled by ``FastPydanticJSONPayloadConverter``"""
+
+    def __init__(self) -> None:
+        converters = DefaultPayloadConverter.default_encoding_payload_converters
+        super().__init__(
+            *(
+                (
+                    FastPydanticJSONPayloadConverter()
+                    if isinstance(converter, JSONPlainPayloadConverter)
+                    else converter
+                )
+                for converter in converters
+            )
+        )
+
+
+class PayloadOffloadCodec(PayloadCodec):
+    """
+    Payload codec that keeps large payloads out of workflow history.
+
+    Payloads of at least ``offload_threshold`` bytes are compressed and written
+    to a local content-addressed blob store; history only keeps their SHA-256
+    reference. Smaller payloads of at least ``compress_threshold`` bytes stay
+    inline but are zlib-compressed when that makes them smaller. The blob store
+    directory must be reachable by every client and worker that shares the
+    Temporal namespace.
+
+    Blobs are not deleted when their workflow closes. ``remove_expired_blobs``
+    deletes blobs that were neither written nor read for ``blob_ttl_seconds``;
+    the TTL must outlast the longest workflow plus the namespace retention
+    period, or old histories can no longer be decoded.
+    """
+
+    def __init__(
+        self,
+        blob_dir: str | os.PathLike[str] = ".payload_blobs",
+        offload_threshold: int = 64 * 1024,
+        compress_threshold: int = 2 * 1024,
+        blob_ttl_seconds: float | None = 7 * 24 * 3600,
+    ) -> None:
+        self.blob_dir = Path(blob_dir)
+        self.offload_threshold = offload_threshold
+        self.compress_threshold = compress_threshold
+        self.blob_ttl_seconds = blob_ttl_seconds
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        encoded = []
+        for payload in payloads:
+            data = payload.SerializeToString()
+            if len(data) >= self.offload_threshold:
+                digest = hashlib.sha256(data).hexdigest()
+                await asyncio.to_thread(self._write_blob, digest, data)
+                encoded.append(
+                    Payload(
+                        metadata={"encoding": BLOB_REF_ENCODING},
+                        data=digest.encode(),
+                    )
+                )
+            elif len(data) >= self.compress_threshold:
+                compressed = zlib.compress(data)
+                if len(compressed) < len(data):
+                    encoded.append(
+                        Payload(metadata={"encoding": ZLIB_ENCODING}, data=compressed)
+                    )
+                else:
+                    encoded.append(payload)
+            else:
+                encoded.append(payload)
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        decoded = []
+        for payload in payloads:
+            encoding = payload.metadata.get("encoding")
+            if encoding == BLOB_REF_ENCODING:
+                data = await asyncio.to_thread(self._read_blob, payload.data.decode())
+            elif encoding == ZLIB_ENCODING:
+                data = zlib.decompress(payload.data)
+            else:
+                decoded.append(payload)
+                continue
+            original = Payload()
+            original.ParseFromString(data)
+            decoded.append(original)
+        return decoded
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def remove_expired_blobs(self) -> int:
+        """Delete blobs unused for ``blob_ttl_seconds``; returns how many were deleted"""
+        if self.blob_ttl_seconds is None or not self.blob_dir.is_dir():
+            return 0
+        expires_before = time.time() - self.blob_ttl_seconds
+        removed = 0
+        for path in self.blob_dir.glob("*/*"):
+            try:
+                if path.stat().st_mtime < expires_before:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                # Removed concurrently by another worker
+                continue
+        return removed
+
+    def _write_blob(self, digest: str, data: bytes) -> None:
+        path = self._blob_path(digest)
+        if path.exists():
+            # Reused blobs count as recently used for the TTL
+            os.utime(path)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{digest}.{os.getpid()}.tmp")
+        temp_path.write_bytes(zlib.compress(data))
+        os.replace(temp_path, path)
+
+    def _read_blob(self, digest: str) -> bytes:
+        path = self._blob_path(digest)
+        data = zlib.decompress(path.read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Payload blob {digest} is corrupt")
+        try:
+            os.utime(path)
+        except OSError:
+            # A read-only blob store is still readable
+            pass
+        return data
+
+
+class DataConverterPlugin(ClientPlugin):
+    """Client plugin that installs the fast payload converter and offload codec"""
+
+    def __init__(self, payload_codec: PayloadCodec | None = None) -> None:
+        self.payload_codec = payload_codec or PayloadOffloadCodec(
+            blob_dir=os.environ.get("PAYLOAD_BLOB_DIR", ".payload_blobs"),
+            offload_threshold=int(
+                os.environ.get("PAYLOAD_OFFLOAD_THRESHOLD_BYTES", str(64 * 1024))
+            ),
+        )
+
+    def configure_client(self, config: ClientConfig) -> ClientConfig:
+        config["data_converter"] = dataclasses.replace(
+            config["data_converter"],
+            payload_converter_class=FastPydanticPayloadConverter,
+            payload_codec=self.payload_codec,
+        )
+        return super().configure_client(config)
@@ -3,13 +3,14 @@ import asyncio
 from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
 from temporalio.client import Client
 
+from pydantic_demos.data_converter import DataConverterPlugin
 from pydantic_demos.workflows.hello_world_workflow import PydanticHelloWorldWorkflow
 
 
 async def main():
     client = await Client.connect(
         "localhost:7233",
-        plugins=[PydanticAIPlugin()],
+        plugins=[PydanticAIPlugin(), DataConverterPlugin()],
     )
 
     result = await client.execute_workflow(
@@ -9,14 +9,84 @@ using Pydantic AI agents.
 import argparse
 import asyncio
 import uuid
+from typing import Any
 
 from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
-from temporalio.client import Client
+from temporalio.client import Client, WithStartWorkflowOperation, WorkflowHandle
+from temporalio.common import WorkflowIDConflictPolicy
 
+from pydantic_demos.data_converter import DataConverterPlugin
 from pydantic_demos.workflows.interactive_research_workflow import (
+    InteractiveResearchResult,
     PydanticInteractiveResearchWorkflow,
 )
-from pydantic_demos.workflows.research_agents.research_models import UserQueryInput
+from pydantic_demos.workflows.research_agents.research_models import (
+    ClarificationInput,
+    ResearchConfig,
+    SingleClarificationInput,
+    UserQueryInput,
+)
+
+
+async def wait_with_report_progress(
+    handle: WorkflowHandle[Any, InteractiveResearchResult],
+    stream_report: bool,
+    poll_interval: float = 1.0,
+) -> tuple[InteractiveResearchResult, bool]:
+    """
+    Wait for the workflow result while printing the report as it is written.
+
+    Returns the result and whether the full report was streamed to the terminal.
+    """
+    if not stream_report:
+        return await handle.result(), False
+
+    result_task = asyncio.create_task(handle.result())
+    cursor = 0
+    generation = 0
+    streamed = False
+    while not result_task.done():
+        try:
+            progress = await handle.query(
+                PydanticInteractiveResearchWorkflow.get_report_progress, cursor
+            )
+        except Exception:
+            progress = None
+
+        if progress is not None and progress.generation != generation:
+            # The writer restarted (e.g. activity retry): start from the beginning
+            if streamed:
+                print("\n\n[Report generation restarted]\n")
+            generation = progress.generation
+            cursor = 0
+            continue
+
+        if progress is not None and progress.text:
+            if not streamed:
+                print("\nWriting report:\n")
+                streamed = True
+            print(progress.text, end="", flush=True)
+            cursor = progress.cursor
+
+        await asyncio.wait({result_task}, timeout=poll_interval)
+
+    result = await result_task
+    if streamed:
+        # Print whatever was generated after the last poll
+        tail = result.markdown_report[cursor:] if generation == 1 else ""
+        print(tail, flush=True)
+    return result, streamed and generation == 1
+
+
+def print_cascade_metrics(result: InteractiveResearchResult) -> None:
+    """Print how many cascaded searches needed the stronger model"""
+    metrics = result.metrics
+    if metrics.cascade_searches:
+        print(
+            f"Search cascade escalated {metrics.cascade_escalations}/"
+            f"{metrics.cascade_searches} searches "
+            f"({metrics.cascade_escalations / metrics.cascade_searches:.0%})"
+        )
 
 
 async def main():
@@ -27,11 +97,44 @@ async def main():
         action="store_true",
         help="Skip clarifying questions and do direct research (default is interactive)",
     )
+    parser.add_argument(
+        "--speculative-planning",
+        action="store_true",
+        help="Plan searches while triage decides whether clarifications are needed",
+    )
+    parser.add_argument(
+        "--speculative-search",
+        action="store_true",
+        help="Search the original query while clarifying questions are answered",
+    )
+    parser.add_argument(
+        "--no-stream-report",
+        action="store_true",
+        help="Print the report only once it is finished instead of while it is written",
+    )
+    parser.add_argument(
+        "--search-cascade",
+        action="store_true",
+        help="Summarize searches with a cheap model first, escalating when needed",
+    )
+    parser.add_argument(
+        "--answers",
+        nargs="+",
+        metavar="ANSWER",
+        help="Answers to the clarifying questions, in order, sent in a single update "
+        "instead of prompting for each question",
+    )
     args = parser.parse_args()
+    config = ResearchConfig(
+        speculative_planning=args.speculative_planning,
+        speculative_search=args.speculative_search,
+        stream_report=not args.no_stream_report,
+        search_cascade=args.search_cascade,
+    )
 
     client = await Client.connect(
         "localhost:7233",
-        plugins=[PydanticAIPlugin()],
+        plugins=[PydanticAIPlugin(), DataConverterPlugin()],
     )
 
     workflow_id = f"pydantic-interactive-research-{uuid.uuid4()}"
@@ -39,18 +142,21 @@ async def main():
     if args.non_interactive:
         # Non-interactive mode - skip clarifications and do direct research
         print(f"Starting direct research for: {args.query}")
-        result = await client.execute_workflow(
+        handle = await client.start_workflow(
             PydanticInteractiveResearchWorkflow.run,
-            args=[args.query, False],  # initial_query, use_clarifications=False
+            args=[args.query, False, config],  # use_clarifications=False
             id=workflow_id,
             task_queue="pydantic-ai-task-queue",
         )
+        result, streamed = await wait_with_report_progress(handle, config.stream_report)
 
         print("\n" + "=" * 60)
         print("RESEARCH COMPLETED")
         print("=" * 60)
         print(f"\nSummary: {result.short_summary}")
-        print(f"\nMarkdown Report:\n{result.markdown_report}")
+        print_cascade_metrics(result)
+        if not streamed:
+            print(f"\nMarkdown Report:\n{result.markdown_report}")
 
         if result.follow_up_questions:
             print(f"\nFollow-up Questions:")
@@ -66,31 +172,48 @@ async def main():
         # DEFAULT INTERACTIVE MODE - Always ask clarifying questions when needed
         print(f"Starting interactive research for: {args.query}")
 
-        # Start the workflow
-        handle = await client.start_workflow(
+        # Start the workflow and the research in a single round trip. The update
+        # returns once triage is done and any clarifying questions are ready; the
+        # research runs afterwards.
+        print("Initializing research...")
+        start_op = WithStartWorkflowOperation(
             PydanticInteractiveResearchWorkflow.run,
-            args=[],  # No initial query for interactive mode
+            args=[None, False, config],  # No initial query for interactive mode
             id=workflow_id,
             task_queue="pydantic-ai-task-queue",
+            id_conflict_policy=WorkflowIDConflictPolicy.FAIL,
         )
-
-        # Start research with the query
-        print("Initializing research...")
-        status = await handle.execute_update(
+        status = await client.execute_update_with_start_workflow(
             PydanticInteractiveResearchWorkflow.start_research,
             UserQueryInput(query=args.query),
+            start_workflow_operation=start_op,
         )
+        handle = await start_op.workflow_handle()
 
         # Check if clarifications are needed
-        if status.clarification_questions:
+        if status.clarification_questions and args.answers:
+            # Answers were given up front: send them all in one update
+            responses = {
+                f"question_{i}": (
+                    args.answers[i]
+                    if i < len(args.answers)
+                    else "No specific preference"
+                )
+                for i in range(len(status.clarification_questions))
+            }
+            status = await handle.execute_update(
+                PydanticInteractiveResearchWorkflow.provide_clarifications,
+                ClarificationInput(responses=responses),
+            )
+            print(
+                f"\nAnswered {len(responses)} clarifying questions. "
+                f"Starting enhanced research..."
+            )
+        elif status.clarification_questions:
             print(f"\nI need some clarifications to provide better research results:")
             print("-" * 50)
 
             # Collect answers to clarifying questions one by one
-            from pydantic_demos.workflows.research_agents.research_models import (
-                SingleClarificationInput,
-            )
-
             for i, question in enumerate(status.clarification_questions):
                 print(f"\nQuestion {i + 1}: {question}")
                 answer = input("Your answer: ").strip()
@@ -109,8 +232,8 @@ async def main():
         else:
             print("No clarifications needed. Proceeding with research...")
 
-        # Wait for research completion
-        result = await handle.result()
+        # Wait for research completion, printing the report as it is written
+        result, streamed = await wait_with_report_progress(handle, config.stream_report)
 
         print("\n" + "=" * 60)
         print("INTERACTIVE RESEARCH COMPLETED")
@@ -125,7 +248,19 @@ async def main():
                 print(f"A: {answer}\n")
 
         print(f"Summary: {result.short_summary}")
-        print(f"\nMarkdown Report:\n{result.markdown_report}")
+        if result.metrics.speculative_plans_used:
+            print(
+                f"Speculative planning saved "
+                f"{result.metrics.speculative_planning_seconds_saved:.1f}s"
+            )
+        if result.metrics.pre_searches_reused:
+            print(
+                f"Reused {result.metrics.pre_searches_reused} searches run "
+                f"while you answered the clarifying questions"
+            )
+        print_cascade_metrics(result)
+        if not streamed:
+            print(f"\nMarkdown Report:\n{result.markdown_report}")
 
         if result.follow_up_questions:
             print(f"\nFollow-up Questions:")
@@ -5,6 +5,8 @@ from pathlib import Path
 from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
 from temporalio.client import Client
 
+from pydantic_demos.data_converter import DataConverterPlugin
+from pydantic_demos.workflows.research_agents.research_models import ResearchConfig
 from pydantic_demos.workflows.research_bot_workflow import PydanticResearchWorkflow
 
 
@@ -16,14 +18,42 @@ async def main():
         default="Caribbean vacation spots in April, optimizing for surfing, hiking and water sports",
         help="Research query to execute",
     )
+    parser.add_argument(
+        "--search-quorum",
+        type=float,
+        default=1.0,
+        help="Fraction of searches that must finish before writing the report (default 1.0)",
+    )
+    parser.add_argument(
+        "--search-deadline",
+        type=float,
+        default=None,
+        help="Seconds after which the report is written with the searches completed so far",
+    )
+    parser.add_argument(
+        "--sectioned-report",
+        action="store_true",
+        help="Write the report as an outline plus sections generated in parallel",
+    )
+    parser.add_argument(
+        "--search-cascade",
+        action="store_true",
+        help="Summarize searches with a cheap model first, escalating when needed",
+    )
 
     args = parser.parse_args()
+    config = ResearchConfig(
+        search_quorum=args.search_quorum,
+        search_deadline_seconds=args.search_deadline,
+        sectioned_report=args.sectioned_report,
+        search_cascade=args.search_cascade,
+    )
 
     # Create client connected to server at the given address
     try:
         client = await Client.connect(
             "localhost:7233",
-            plugins=[PydanticAIPlugin()],
+            plugins=[PydanticAIPlugin(), DataConverterPlugin()],
         )
         print(f"🔗 Connected to Temporal server")
     except Exception as e:
@@ -48,7 +78,7 @@ async def main():
         try:
             result = await client.execute_workflow(
                 PydanticResearchWorkflow.run,
-                args=[query],
+                args=[query, config],
                 id="pydantic-research-workflow",
                 task_queue="pydantic-ai-task-queue",
             )
@@ -72,6 +102,14 @@ async def main():
         print(f"📄 Report saved to: {markdown_file}")
 
         print(f"\n📋 Summary: {result.short_summary}")
+        print(
+            f"🔎 Searches used: {result.metrics.searches_used}/{result.metrics.searches_planned}"
+        )
+        if result.metrics.cascade_searches:
+            print(
+                f"🪜 Search escalations: {result.metrics.cascade_escalations}/"
+                f"{result.metrics.cascade_searches}"
+            )
 
         print(f"\n🔍 Follow-up questions:")
         for i, question in enumerate(result.follow_up_questions, 1):
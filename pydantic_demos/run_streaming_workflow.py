@@ -31,6 +31,8 @@ with workflow.unsafe.imports_passed_through():
     from fastapi import FastAPI, WebSocket
     import uvicorn
 
+    from pydantic_demos.data_converter import DataConverterPlugin
+
 WEATHER_TASK_QUEUE = 'weather'
 
 @dataclass
@@ -86,7 +88,7 @@ async def websocket_endpoint(websocket: WebSocket):
 async def run_workflow():
     client = await Client.connect(
         'localhost:7233',  
-        plugins=[PydanticAIPlugin()],
+        plugins=[PydanticAIPlugin(), DataConverterPlugin()],
     )
 
     async with Worker(
@@ -1,10 +1,18 @@
 import asyncio
 import logging
+import os
+from datetime import timedelta
 
 from pydantic_ai.durable_exec.temporal import AgentPlugin, PydanticAIPlugin
 from temporalio.client import Client
 from temporalio.worker import Worker
 
+from pydantic_demos.data_converter import DataConverterPlugin, PayloadOffloadCodec
+from pydantic_demos.workflows.activity_heartbeat import HEARTBEAT_INTERVAL_SECONDS
+from pydantic_demos.workflows.circuit_breaker import (
+    configure_circuit_breakers,
+    get_circuit_breakers,
+)
 from pydantic_demos.workflows.hello_world_workflow import PydanticHelloWorldWorkflow
 from pydantic_demos.workflows.hello_world_workflow import (
     temporal_agent as hello_world_temporal_agent,
@@ -12,37 +20,179 @@ from pydantic_demos.workflows.hello_world_workflow import (
 from pydantic_demos.workflows.interactive_research_workflow import (
     PydanticInteractiveResearchWorkflow,
 )
+from pydantic_demos.workflows.model_provider import (
+    connection_pool_stats,
+    warm_up_connections,
+)
+from pydantic_demos.workflows.pdf_generation_activity import (
+    PDF_TASK_QUEUE,
+    configure_pdf_output_store,
+    configure_pdf_render_pool,
+    generate_pdf,
+    shutdown_pdf_render_pool,
+)
+from pydantic_demos.workflows.rate_limiter import (
+    configure_rate_limiter,
+    default_rate_limit_db,
+    get_rate_limiter,
+    parse_rate_limits,
+)
+from pydantic_demos.workflows.research_agents.clarifying_agent import (
+    local_runner as clarifying_local_runner,
+)
 from pydantic_demos.workflows.research_agents.clarifying_agent import (
     temporal_agent as clarifying_temporal_agent,
 )
+from pydantic_demos.workflows.research_agents.condenser_agent import (
+    temporal_agent as condenser_temporal_agent,
+)
 from pydantic_demos.workflows.research_agents.pdf_generator_agent import (
     temporal_agent as pdf_generator_temporal_agent,
 )
 from pydantic_demos.workflows.research_agents.planner_agent import (
     temporal_agent as planner_temporal_agent,
 )
+from pydantic_demos.workflows.research_agents.search_agent import (
+    fast_temporal_agent as search_fast_temporal_agent,
+)
+from pydantic_demos.workflows.research_agents.search_agent import (
+    search_hedging_policy,
+    search_model_limiter,
+)
 from pydantic_demos.workflows.research_agents.search_agent import (
     temporal_agent as search_temporal_agent,
 )
+from pydantic_demos.workflows.research_agents.triage_agent import (
+    local_runner as triage_local_runner,
+)
 from pydantic_demos.workflows.research_agents.triage_agent import (
     temporal_agent as triage_temporal_agent,
 )
+from pydantic_demos.workflows.research_agents.triage_agent import triage_hedging_policy
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    outline_temporal_agent as writer_outline_temporal_agent,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    section_temporal_agent as writer_section_temporal_agent,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    streaming_temporal_agent as writer_streaming_temporal_agent,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    summary_temporal_agent as writer_summary_temporal_agent,
+)
 from pydantic_demos.workflows.research_agents.writer_agent import (
     temporal_agent as writer_temporal_agent,
 )
 from pydantic_demos.workflows.research_bot_workflow import PydanticResearchWorkflow
+from pydantic_demos.workflows.search_cache import SearchResultCache
 from pydantic_demos.workflows.tools_workflow import PydanticToolsWorkflow
 from pydantic_demos.workflows.tools_workflow import (
     temporal_agent as tools_temporal_agent,
 )
 
 
+async def log_worker_stats(
+    search_cache: SearchResultCache, interval_seconds: float = 60.0
+) -> None:
+    """Periodically log worker-wide counters"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        stats = search_cache.stats()
+        logging.info(
+            f"Search cache: {stats.hits} hits ({stats.disk_hits} from disk), "
+            f"{stats.coalesced} coalesced, {stats.misses} misses, "
+            f"{stats.saved_searches} search agent runs saved, {stats.entries} entries"
+        )
+        limiter_stats = search_model_limiter.stats()
+        logging.info(
+            f"Search model limiter: limit {limiter_stats.limit}, "
+            f"{limiter_stats.in_flight} in flight, {limiter_stats.waiting} waiting, "
+            f"{limiter_stats.throttled} rate limited, {limiter_stats.slow} slow"
+        )
+        for name, hedging in (
+            ("Search", search_hedging_policy),
+            ("Triage", triage_hedging_policy),
+        ):
+            hedge_stats = hedging.stats()
+            delay = (
+                f"{hedge_stats.delay_seconds:.1f}s"
+                if hedge_stats.delay_seconds is not None
+                else "warming up"
+            )
+            logging.info(
+                f"{name} model hedging: {hedge_stats.hedged}/{hedge_stats.requests} "
+                f"requests hedged ({hedge_stats.hedge_rate:.1%}), "
+                f"{hedge_stats.hedge_wins} hedge wins, "
+                f"{hedge_stats.budget_exhausted} over budget, delay {delay}"
+            )
+        for breaker in get_circuit_breakers().stats():
+            logging.info(
+                f"Circuit breaker {breaker.model_name}: {breaker.state.value}, "
+                f"{breaker.requests} requests, {breaker.failures} failed, "
+                f"{breaker.slow} slow, opened {breaker.times_opened} times, "
+                f"{breaker.rejected} rejected"
+            )
+        rate_limiter = get_rate_limiter()
+        if rate_limiter is not None:
+            rate_stats = rate_limiter.stats()
+            logging.info(
+                f"Model rate limiter: {rate_stats.acquired} requests admitted, "
+                f"{rate_stats.waited} waited {rate_stats.wait_seconds:.1f}s in total, "
+                f"{rate_stats.throttled} rate limited by the provider"
+            )
+        pool_stats = connection_pool_stats()
+        logging.info(
+            f"Provider connection pool: {pool_stats.connections} connections "
+            f"({pool_stats.active} active, {pool_stats.idle} idle, "
+            f"{pool_stats.http2} HTTP/2), {pool_stats.queued_requests} requests queued"
+        )
+
+
+async def remove_expired_payload_blobs(
+    codec: PayloadOffloadCodec, interval_seconds: float = 3600.0
+) -> None:
+    """Periodically delete offloaded payloads older than the blob TTL"""
+    while True:
+        removed = await asyncio.to_thread(codec.remove_expired_blobs)
+        if removed:
+            logging.info(f"Payload blob store: removed {removed} expired blobs")
+        await asyncio.sleep(interval_seconds)
+
+
 async def main():
     logging.basicConfig(level=logging.INFO)
 
+    search_cache = SearchResultCache(
+        max_entries=int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "1024")),
+        ttl_seconds=float(os.environ.get("SEARCH_CACHE_TTL_SECONDS", "900")),
+        sqlite_path=os.environ.get("SEARCH_CACHE_SQLITE_PATH"),
+    )
+
+    # Every worker process on the host pointing at the same file shares these budgets
+    configure_rate_limiter(
+        os.environ.get("MODEL_RATE_LIMIT_DB") or default_rate_limit_db(),
+        parse_rate_limits(os.environ.get("MODEL_RATE_LIMITS", "")),
+    )
+
+    configure_circuit_breakers(
+        error_threshold=float(os.environ.get("CIRCUIT_BREAKER_ERROR_RATE", "0.5")),
+        open_seconds=float(os.environ.get("CIRCUIT_BREAKER_OPEN_SECONDS", "30")),
+    )
+
+    blob_ttl_seconds = float(os.environ.get("PAYLOAD_BLOB_TTL_SECONDS", "604800"))
+    payload_codec = PayloadOffloadCodec(
+        blob_dir=os.environ.get("PAYLOAD_BLOB_DIR", ".payload_blobs"),
+        offload_threshold=int(
+            os.environ.get("PAYLOAD_OFFLOAD_THRESHOLD_BYTES", str(64 * 1024))
+        ),
+        # 0 keeps blobs forever
+        blob_ttl_seconds=blob_ttl_seconds or None,
+    )
+
     client = await Client.connect(
         "localhost:7233",
-        plugins=[PydanticAIPlugin()],
+        plugins=[PydanticAIPlugin(), DataConverterPlugin(payload_codec)],
     )
 
     worker = Worker(
@@ -54,18 +204,65 @@ async def main():
             PydanticResearchWorkflow,
             PydanticInteractiveResearchWorkflow,
         ],
+        activities=[
+            search_cache.lookup,
+            search_cache.store,
+            triage_local_runner.activity,
+            clarifying_local_runner.activity,
+        ],
+        # Model activities heartbeat without a heartbeat timeout; send those
+        # heartbeats promptly so workflow cancellation reaches them quickly
+        default_heartbeat_throttle_interval=timedelta(
+            seconds=HEARTBEAT_INTERVAL_SECONDS
+        ),
         plugins=[
             AgentPlugin(hello_world_temporal_agent),
             AgentPlugin(tools_temporal_agent),
             AgentPlugin(planner_temporal_agent),
             AgentPlugin(search_temporal_agent),
+            AgentPlugin(search_fast_temporal_agent),
             AgentPlugin(writer_temporal_agent),
+            AgentPlugin(writer_streaming_temporal_agent),
+            AgentPlugin(writer_outline_temporal_agent),
+            AgentPlugin(writer_section_temporal_agent),
+            AgentPlugin(writer_summary_temporal_agent),
+            AgentPlugin(condenser_temporal_agent),
             AgentPlugin(triage_temporal_agent),
             AgentPlugin(clarifying_temporal_agent),
             AgentPlugin(pdf_generator_temporal_agent),
         ],
     )
-    await worker.run()
+
+    # PDF rendering is CPU-bound: it runs in a process pool and gets its own
+    # task queue so its concurrency is tuned independently of the agents
+    pdf_render_processes = int(
+        os.environ.get("PDF_RENDER_PROCESSES", str(os.cpu_count() or 1))
+    )
+    configure_pdf_render_pool(pdf_render_processes)
+    configure_pdf_output_store(
+        os.environ.get("PDF_OUTPUT_DIR", "pdf_output"),
+        int(os.environ.get("PDF_OUTPUT_MAX_BYTES", str(512 << 20))),
+    )
+    pdf_worker = Worker(
+        client,
+        task_queue=PDF_TASK_QUEUE,
+        activities=[generate_pdf],
+        max_concurrent_activities=int(
+            os.environ.get("PDF_MAX_CONCURRENT_ACTIVITIES", str(pdf_render_processes))
+        ),
+    )
+
+    # Open provider connections now so the first model requests skip TLS setup
+    await warm_up_connections(int(os.environ.get("OPENAI_HTTP_WARM_CONNECTIONS", "4")))
+
+    stats_task = asyncio.create_task(log_worker_stats(search_cache))
+    blob_sweep_task = asyncio.create_task(remove_expired_payload_blobs(payload_codec))
+    try:
+        await asyncio.gather(worker.run(), pdf_worker.run())
+    finally:
+        stats_task.cancel()
+        blob_sweep_task.cancel()
+        shutdown_pdf_render_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from temporalio import activity
+
+HEARTBEAT_INTERVAL_SECONDS = 2.0
+
+
+@asynccontextmanager
+async def heartbeat_while_running(
+    interval: float = HEARTBEAT_INTERVAL_SECONDS,
+) -> AsyncIterator[None]:
+    """
+    Heartbeat the current activity in the background until the block exits.
+
+    Temporal delivers activity cancellation in heartbeat responses, so long
+    model requests and renders only notice that their workflow cancelled them
+    if they heartbeat. Outside an activity this does nothing.
+    """
+    if not activity.in_activity():
+        yield
+        return
+
+    async def beat() -> None:
+        while True:
+            activity.heartbeat()
+            await asyncio.sleep(interval)
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
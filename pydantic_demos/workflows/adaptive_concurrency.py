@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+
+@dataclass
+class LimiterStats:
+    """Snapshot of an adaptive limiter's state"""
+
+    limit: int
+    in_flight: int
+    waiting: int
+    throttled: int
+    slow: int
+    decreases: int
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception signals that the provider is rate limiting us"""
+    return getattr(error, "status_code", None) == 429
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Worker-wide concurrency limit that adapts with AIMD.
+
+    Every successful request that finishes within ``latency_target_seconds``
+    grows the limit by roughly one per window of ``limit`` requests. A rate
+    limit (HTTP 429) or a request slower than the target shrinks the limit
+    multiplicatively, at most once per ``cooldown_seconds`` so that a burst of
+    errors from one overload episode only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_target_seconds: float = 30.0,
+        backoff_factor: float = 0.5,
+        cooldown_seconds: float = 2.0,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.backoff_factor = backoff_factor
+        self.cooldown_seconds = cooldown_seconds
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiting = 0
+        self._last_decrease = 0.0
+        self._throttled = 0
+        self._slow = 0
+        self._decreases = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            limit=self.limit,
+            in_flight=self._in_flight,
+            waiting=self._waiting,
+            throttled=self._throttled,
+            slow=self._slow,
+            decreases=self._decreases,
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one unit of concurrency for the duration of a request"""
+        async with self._condition:
+            self._waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self._throttled += 1
+                self._decrease()
+            raise
+        else:
+            latency = time.monotonic() - start
+            if latency > self.latency_target_seconds:
+                self._slow += 1
+                self._decrease()
+            else:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * self.backoff_factor)
+        self._decreases += 1
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a model whose breaker is open"""
+
+    def __init__(self, model_name: str) -> None:
+        super().__init__(f"Circuit breaker for {model_name} is open")
+        self.model_name = model_name
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Snapshot of one model's breaker"""
+
+    model_name: str
+    state: CircuitState
+    requests: int
+    failures: int
+    slow: int
+    times_opened: int
+    rejected: int
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """Whether an error says the provider is unhealthy rather than the request bad"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        return True
+    return status_code >= 500 or status_code in (408, 429)
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one model and stops sending it requests when it degrades.
+
+    The breaker opens when at least ``error_threshold`` of the last ``window``
+    requests failed or were slower than the latency threshold they were
+    tracked with. The threshold comes from the caller, since agents sharing a
+    model can have very different response times. While open, requests are
+    rejected with ``CircuitOpenError``. After ``open_seconds`` it lets
+    ``half_open_probes`` requests through; it closes once they all succeed and
+    opens again if any of them fails.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        error_threshold: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2,
+    ) -> None:
+        self.model_name = model_name
+        self.error_threshold = error_threshold
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._requests = 0
+        self._failures = 0
+        self._slow = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def stats(self) -> CircuitBreakerStats:
+        return CircuitBreakerStats(
+            model_name=self.model_name,
+            state=self._state,
+            requests=self._requests,
+            failures=self._failures,
+            slow=self._slow,
+            times_opened=self._times_opened,
+            rejected=self._rejected,
+        )
+
+    def rejects_requests(self) -> bool:
+        """Whether a request sent now would be rejected"""
+        if self._state is CircuitState.OPEN:
+            return time.monotonic() - self._opened_at < self.open_seconds
+        if self._state is CircuitState.HALF_OPEN:
+            return self._probes_in_flight >= self.half_open_probes
+        return False
+
+    @asynccontextmanager
+    async def track(
+        self, latency_threshold_seconds: float | None = None
+    ) -> AsyncIterator[None]:
+        """
+        Admit one request and record how it went.
+
+        Requests slower than ``latency_threshold_seconds`` count as failures.
+        Without a threshold only errors count, as for streamed responses, which
+        last as long as the output is long.
+        """
+        if self.rejects_requests():
+            self._rejected += 1
+            raise CircuitOpenError(self.model_name)
+        if self._state is CircuitState.OPEN:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_successes = 0
+        probe = self._state is CircuitState.HALF_OPEN
+        if probe:
+            self._probes_in_flight += 1
+
+        self._requests += 1
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # A request cancelled after the latency threshold, e.g. by an
+            # activity timeout, is a slow request; earlier ones are no signal
+            elapsed = time.monotonic() - started
+            if (
+                latency_threshold_seconds is not None
+                and elapsed >= latency_threshold_seconds
+            ):
+                self._slow += 1
+                self._record(healthy=False)
+            raise
+        except Exception as e:
+            if is_provider_failure(e):
+                self._failures += 1
+                self._record(healthy=False)
+            else:
+                self._record(healthy=True)
+            raise
+        else:
+            elapsed = time.monotonic() - started
+            slow = (
+                latency_threshold_seconds is not None
+                and elapsed > latency_threshold_seconds
+            )
+            if slow:
+                self._slow += 1
+            self._record(healthy=not slow)
+        finally:
+            if probe:
+                self._probes_in_flight -= 1
+
+    def _record(self, healthy: bool) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            if not healthy:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._state = CircuitState.CLOSED
+                self._outcomes.clear()
+            return
+        if self._state is CircuitState.OPEN:
+            # Finished after the breaker opened; it started before that
+            return
+
+        self._outcomes.append(healthy)
+        requests = len(self._outcomes)
+        unhealthy = self._outcomes.count(False)
+        if (
+            requests >= self.min_requests
+            and unhealthy >= self.error_threshold * requests
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+
+
+class CircuitBreakerRegistry:
+    """One breaker per model name, shared by every agent in the worker"""
+
+    def __init__(
+        self,
+        error_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+    ) -> None:
+        self.error_threshold = error_threshold
+        self.open_seconds = open_seconds
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, model_name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model_name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                model_name,
+                error_threshold=self.error_threshold,
+                open_seconds=self.open_seconds,
+            )
+            self._breakers[model_name] = breaker
+        return breaker
+
+    def stats(self) -> list[CircuitBreakerStats]:
+        return [breaker.stats() for breaker in self._breakers.values()]
+
+
+_circuit_breakers = CircuitBreakerRegistry()
+
+
+def configure_circuit_breakers(
+    error_threshold: float = 0.5,
+    open_seconds: float = 30.0,
+) -> CircuitBreakerRegistry:
+    """Set the thresholds of the breakers model requests in this process use"""
+    global _circuit_breakers
+    _circuit_breakers = CircuitBreakerRegistry(error_threshold, open_seconds)
+    return _circuit_breakers
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    return _circuit_breakers
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeStats:
+    """Snapshot of a hedging policy's counters"""
+
+    requests: int
+    hedged: int
+    hedge_wins: int
+    budget_exhausted: int
+    delay_seconds: float | None
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.requests if self.requests else 0.0
+
+
+def _discard_result(task: asyncio.Task[Any]) -> None:
+    # Retrieve the loser's exception so asyncio does not log it as unhandled
+    if not task.cancelled():
+        task.exception()
+
+
+class HedgingPolicy:
+    """
+    Sends a duplicate request when the first is slower than usual.
+
+    If a request has not finished after the ``percentile`` latency of the last
+    ``window`` successful requests, the same request is sent again and the
+    first successful response wins; the other request is cancelled. Hedges are
+    limited to ``budget_ratio`` of all requests, so a provider that is slow
+    across the board does not get twice the traffic. Until ``min_samples``
+    latencies are known, no requests are hedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget_ratio: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay_seconds: float = 0.5,
+    ) -> None:
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._budget_exhausted = 0
+
+    def stats(self) -> HedgeStats:
+        return HedgeStats(
+            requests=self._requests,
+            hedged=self._hedged,
+            hedge_wins=self._hedge_wins,
+            budget_exhausted=self._budget_exhausted,
+            delay_seconds=self.hedge_delay(),
+        )
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while there are too few samples"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        index = round(self.percentile * (len(latencies) - 1))
+        return max(self.min_delay_seconds, latencies[index])
+
+    async def run(self, send: Callable[[], Awaitable[T]]) -> T:
+        """Run ``send``, calling it a second time if the first call is slow"""
+        self._requests += 1
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(self._timed(send))
+        tasks = [primary]
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+            if primary.done() or delay is None:
+                return await primary
+            if self._hedged >= self.budget_ratio * self._requests:
+                self._budget_exhausted += 1
+                return await primary
+
+            self._hedged += 1
+            hedge = asyncio.ensure_future(self._timed(send))
+            tasks.append(hedge)
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Prefer a successful response; an error only wins if both fail
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        if task is hedge:
+                            self._hedge_wins += 1
+                        return task.result()
+                if not pending:
+                    return await primary
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                task.add_done_callback(_discard_result)
+
+    async def _timed(self, send: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        result = await send()
+        self._latencies.append(time.monotonic() - started)
+        return result
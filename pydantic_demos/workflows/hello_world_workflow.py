@@ -2,8 +2,14 @@ from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
 from temporalio import workflow
 
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
+
 agent = Agent(
-    "gpt-4",
+    ManagedModel(openai_model("gpt-4")),
     instructions="You only respond in haikus.",
     name="Assistant",
 )
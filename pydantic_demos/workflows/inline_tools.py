@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import inspect
+from typing import Any, Callable, Literal
+
+# ID of the toolset holding the tools passed to ``Agent(tools=...)``
+AGENT_TOOLSET_ID = "<agent>"
+
+
+def inline_tool_activity_config(
+    *tools: Callable[..., Any],
+) -> dict[str, dict[str, Literal[False]]]:
+    """
+    Build a ``TemporalAgent`` ``tool_activity_config`` that runs tools inline.
+
+    By default every tool call is its own activity. Tools listed here are
+    called directly in the workflow instead, saving the activity round trip and
+    its history events. Only use this for cheap, deterministic async functions
+    without I/O, since they are subject to the workflow sandbox and replayed.
+    """
+    for tool in tools:
+        if not inspect.iscoroutinefunction(tool):
+            raise ValueError(f"Inline tool {tool.__name__!r} must be an async function")
+    return {AGENT_TOOLSET_ID: {tool.__name__: False for tool in tools}}
@@ -2,12 +2,24 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from typing import Optional
+from datetime import timedelta
+from typing import Optional, TypeVar
 
 from temporalio import workflow
 
+from pydantic_demos.workflows.local_agent_runner import LocalAgentRunner
+from pydantic_demos.workflows.pdf_generation_activity import (
+    PDF_TASK_QUEUE,
+    StylingOptions,
+    generate_pdf,
+    split_report_title,
+)
+from pydantic_demos.workflows.report_writing import (
+    condense_search_results,
+    write_sectioned_report,
+)
 from pydantic_demos.workflows.research_agents.clarifying_agent import (
-    temporal_agent as clarifying_agent,
+    local_runner as clarifying_runner,
 )
 from pydantic_demos.workflows.research_agents.pdf_generator_agent import (
     temporal_agent as pdf_generator_agent,
@@ -19,16 +31,33 @@ from pydantic_demos.workflows.research_agents.planner_agent import (
 from pydantic_demos.workflows.research_agents.planner_agent import (
     temporal_agent as planner_agent,
 )
+from pydantic_demos.workflows.research_agents.research_models import (
+    ResearchConfig,
+    ResearchMetrics,
+)
 from pydantic_demos.workflows.research_agents.search_agent import (
     temporal_agent as search_agent,
 )
 from pydantic_demos.workflows.research_agents.triage_agent import (
-    temporal_agent as triage_agent,
+    local_runner as triage_runner,
 )
 from pydantic_demos.workflows.research_agents.writer_agent import ReportData
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    streaming_temporal_agent as writer_streaming_agent,
+)
 from pydantic_demos.workflows.research_agents.writer_agent import (
     temporal_agent as writer_agent,
 )
+from pydantic_demos.workflows.search_cache import run_cached_search
+from pydantic_demos.workflows.search_cascade import run_search_cascade
+from pydantic_demos.workflows.search_dedup import dedupe_search_plan, query_similarity
+from pydantic_demos.workflows.search_fanout import collect_search_results
+from pydantic_demos.workflows.task_tracker import TaskTracker
+
+PDF_GENERATION_TIMEOUT = timedelta(seconds=30)
+PDF_HEARTBEAT_TIMEOUT = timedelta(seconds=10)
+
+OutputT = TypeVar("OutputT")
 
 
 @dataclass
@@ -37,16 +66,43 @@ class ClarificationResult:
 
     needs_clarifications: bool
     questions: Optional[list[str]] = None
-    research_output: Optional[str] = None
-    report_data: Optional[ReportData] = None
+
+
+@dataclass
+class SpeculativePlan:
+    """A search plan started alongside triage, before knowing it is needed"""
+
+    query: str
+    task: asyncio.Task[tuple[WebSearchPlan, float]]
+    triage_seconds: float = 0.0
 
 
 class PydanticInteractiveResearchManager:
     """Interactive research manager using Pydantic AI agents"""
 
-    def __init__(self):
+    def __init__(self, config: ResearchConfig | None = None):
         # Agents are already instantiated as temporal_agents in their modules
-        pass
+        self.config = config or ResearchConfig()
+        self.metrics = ResearchMetrics()
+        self.search_cache_hits = 0
+        self.tasks = TaskTracker()
+        self.speculative_plan: SpeculativePlan | None = None
+        # Results of searches on the original query, keyed by search term
+        self.pre_search_results: dict[str, str] = {}
+        self.pre_search_task: asyncio.Task[None] | None = None
+        # One task per pre-searched term, so they can be awaited or cancelled alone
+        self.pre_search_term_tasks: dict[str, asyncio.Task[str | None]] = {}
+
+    @property
+    def background_work_pending(self) -> bool:
+        """Whether speculative searches are still running in the background"""
+        return self.pre_search_task is not None and not self.pre_search_task.done()
+
+    def cancel_outstanding(self) -> int:
+        """Cancel all in-flight research work, e.g. when the workflow is ended"""
+        cancelled = self.tasks.cancel_all()
+        self.metrics.tasks_cancelled += cancelled
+        return cancelled
 
     async def run(self, query: str, use_clarifications: bool = False) -> str:
         """
@@ -68,45 +124,57 @@ class PydanticInteractiveResearchManager:
         """Original direct research flow"""
         workflow.logger.info(f"Starting direct research for: {query}")
 
-        search_plan = await self._plan_searches(query)
+        search_plan = await self._take_speculative_plan(query)
+        if search_plan is None:
+            search_plan = await self._plan_searches(query)
         search_results = await self._perform_searches(search_plan)
         report = await self._write_report(query, search_results)
 
         return report
 
     async def run_with_clarifications_start(self, query: str) -> ClarificationResult:
-        """Start clarification flow and return whether clarifications are needed"""
+        """
+        Start clarification flow and return whether clarifications are needed.
+
+        Only triage and question generation run here; the caller runs the
+        research itself once it has any clarification answers.
+        """
         workflow.logger.info(f"Starting clarification check for: {query}")
 
+        if self.config.speculative_planning:
+            # Plan as if no clarifications are needed while triage decides
+            self.speculative_plan = SpeculativePlan(
+                query=query,
+                task=self.tasks.create_task(self._timed_plan_searches(query)),
+            )
+
         # Use triage agent to determine if clarifications are needed
-        triage_result = await triage_agent.run(query)
-        triage_output = triage_result.output
+        triage_started = workflow.time()
+        triage_output = await self._run_small_agent(triage_runner, query)
+        if self.speculative_plan is not None:
+            self.speculative_plan.triage_seconds = workflow.time() - triage_started
 
         workflow.logger.info(
             f"Triage decision: needs_clarifications={triage_output.needs_clarifications}"
         )
 
         if triage_output.needs_clarifications:
+            if self.config.speculative_search:
+                # Search the original query while the user answers questions
+                self.pre_search_task = self.tasks.create_task(self._pre_search(query))
+            else:
+                self._discard_speculative_plan()
             # Generate clarifying questions
-            clarifications_result = await clarifying_agent.run(query)
-            clarifications = clarifications_result.output
+            clarifications = await self._run_small_agent(clarifying_runner, query)
 
             return ClarificationResult(
                 needs_clarifications=True, questions=clarifications.questions
             )
         else:
-            # No clarifications needed, continue with research
             workflow.logger.info(
                 "No clarifications needed, proceeding with direct research"
             )
-            search_plan = await self._plan_searches(query)
-            search_results = await self._perform_searches(search_plan)
-            report = await self._write_report(query, search_results)
-            return ClarificationResult(
-                needs_clarifications=False,
-                research_output=report.markdown_report,
-                report_data=report,
-            )
+            return ClarificationResult(needs_clarifications=False)
 
     async def run_with_clarifications_complete(
         self, original_query: str, questions: list[str], responses: dict[str, str]
@@ -121,13 +189,26 @@ class PydanticInteractiveResearchManager:
 
         workflow.logger.info(f"Enriched query: {enriched_query}")
 
-        # Now run the full research pipeline with the enriched query
+        # Now run the full research pipeline with the enriched query, only
+        # searching for what the pre-search on the original query did not cover
         search_plan = await self._plan_searches(enriched_query)
-        search_results = await self._perform_searches(search_plan)
+        search_results, search_plan = await self._reuse_pre_search(search_plan)
+        if search_plan.searches:
+            search_results += await self._perform_searches(search_plan)
         report = await self._write_report(enriched_query, search_results)
 
         return report
 
+    async def _run_small_agent(
+        self, runner: LocalAgentRunner[OutputT], prompt: str
+    ) -> OutputT:
+        """Run a cheap agent, as a local activity if the config asks for it"""
+        return await runner.run(
+            prompt,
+            local=runner.name in self.config.local_activity_agents,
+            timeout=timedelta(seconds=self.config.local_agent_timeout_seconds),
+        )
+
     def _enrich_query(
         self, original_query: str, questions: list[str], responses: dict[str, str]
     ) -> str:
@@ -148,31 +229,209 @@ class PydanticInteractiveResearchManager:
         workflow.logger.info(f"Generated {len(search_plan.searches)} search queries")
         return search_plan
 
+    async def _timed_plan_searches(self, query: str) -> tuple[WebSearchPlan, float]:
+        started = workflow.time()
+        search_plan = await self._plan_searches(query)
+        return search_plan, workflow.time() - started
+
+    async def _take_speculative_plan(self, query: str) -> WebSearchPlan | None:
+        """Use the plan started alongside triage for ``query``, if there is one"""
+        speculative = self.speculative_plan
+        if speculative is None:
+            return None
+        if speculative.query != query:
+            self._discard_speculative_plan()
+            return None
+
+        self.speculative_plan = None
+        try:
+            search_plan, plan_seconds = await speculative.task
+        except Exception as e:
+            workflow.logger.warning(f"Speculative planning failed, planning again: {e}")
+            self.metrics.speculative_plans_wasted += 1
+            return None
+
+        # Sequential planning would have started only after triage finished
+        saved = min(speculative.triage_seconds, plan_seconds)
+        self.metrics.speculative_plans_used += 1
+        self.metrics.speculative_planning_seconds_saved += saved
+        workflow.logger.info(f"Reusing speculative search plan, saved {saved:.1f}s")
+        return search_plan
+
+    def _discard_speculative_plan(self) -> None:
+        """Cancel a speculative plan that turned out not to be needed"""
+        if self.speculative_plan is None:
+            return
+        self.speculative_plan.task.cancel()
+        self.speculative_plan = None
+        self.metrics.speculative_plans_wasted += 1
+        workflow.logger.info("Discarded speculative search plan")
+
+    async def _pre_search(self, query: str) -> None:
+        """Plan and run searches for the original query ahead of the clarifications"""
+        search_plan = await self._take_speculative_plan(query)
+        if search_plan is None:
+            search_plan = await self._plan_searches(query)
+        search_plan = self._dedupe_searches(search_plan)
+
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_searches)
+        for item in search_plan.searches:
+            self.pre_search_term_tasks[item.query] = self.tasks.create_task(
+                self._pre_search_term(item, semaphore)
+            )
+        # Searches the enriched plan does not need are cancelled, not failed
+        await asyncio.gather(
+            *self.pre_search_term_tasks.values(), return_exceptions=True
+        )
+        workflow.logger.info(
+            f"Pre-searched {len(self.pre_search_results)} terms for the original query"
+        )
+
+    async def _pre_search_term(
+        self, item: WebSearchItem, semaphore: asyncio.Semaphore
+    ) -> str | None:
+        result = await self._bounded_search(item, semaphore)
+        if result is not None:
+            self.pre_search_results[item.query] = result
+            self.metrics.pre_searches_completed += 1
+        return result
+
+    async def _reuse_pre_search(
+        self, search_plan: WebSearchPlan
+    ) -> tuple[list[str], WebSearchPlan]:
+        """
+        Split a plan into results the pre-search already has and searches still to run.
+
+        A planned search reuses the pre-search result with the most similar term
+        when the similarity reaches ``search_dedup_threshold``; each pre-search
+        result is reused at most once. Matched pre-searches that are still
+        running are awaited and the unmatched ones are cancelled. A pre-search
+        that is still being planned has nothing to match yet and is cancelled.
+        """
+        pre_search_task, self.pre_search_task = self.pre_search_task, None
+        term_tasks, self.pre_search_term_tasks = self.pre_search_term_tasks, {}
+        if pre_search_task is not None and not pre_search_task.done():
+            if not term_tasks:
+                pre_search_task.cancel()
+        elif (
+            pre_search_task is not None
+            and not pre_search_task.cancelled()
+            and pre_search_task.exception() is not None
+        ):
+            workflow.logger.warning(f"Pre-search failed: {pre_search_task.exception()}")
+
+        in_flight = {term: task for term, task in term_tasks.items() if not task.done()}
+        available = list(self.pre_search_results) + list(in_flight)
+        matches: list[tuple[WebSearchItem, str]] = []
+        delta: list[WebSearchItem] = []
+        for item in search_plan.searches:
+            scores = [query_similarity(item.query, term) for term in available]
+            best = max(range(len(scores)), key=scores.__getitem__, default=None)
+            if best is not None and scores[best] >= self.config.search_dedup_threshold:
+                matches.append((item, available.pop(best)))
+            else:
+                delta.append(item)
+
+        matched_terms = {term for _, term in matches}
+        cancelled = 0
+        for term, task in in_flight.items():
+            if term not in matched_terms:
+                task.cancel()
+                cancelled += 1
+        await asyncio.gather(
+            *(task for term, task in in_flight.items() if term in matched_terms),
+            return_exceptions=True,
+        )
+
+        reused: list[str] = []
+        for item, term in matches:
+            result = self.pre_search_results.get(term)
+            if result is None:
+                # The matched pre-search failed, so search the planned term
+                delta.append(item)
+            else:
+                reused.append(result)
+
+        self.metrics.pre_searches_reused += len(reused)
+        workflow.logger.info(
+            f"Reusing {len(reused)} pre-searched results, cancelled {cancelled} "
+            f"unneeded pre-searches, {len(delta)} searches left to run"
+        )
+        return reused, WebSearchPlan(searches=delta)
+
+    def _dedupe_searches(self, search_plan: WebSearchPlan) -> WebSearchPlan:
+        """Merge near-duplicate search terms before fanning out"""
+        deduped_plan, pruned = dedupe_search_plan(
+            search_plan, self.config.search_dedup_threshold
+        )
+        workflow.logger.info(
+            f"Pruned {pruned} near-duplicate searches, {len(deduped_plan.searches)} remaining"
+        )
+        return deduped_plan
+
     async def _perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
         """Perform web searches in parallel"""
-        workflow.logger.info(f"Performing {len(search_plan.searches)} web searches")
+        search_plan = self._dedupe_searches(search_plan)
+        workflow.logger.info(
+            f"Performing {len(search_plan.searches)} web searches, "
+            f"at most {self.config.max_concurrent_searches} at a time"
+        )
 
-        num_completed = 0
+        # Bound in-flight searches; results still stream back in completion order
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_searches)
         tasks = [
-            asyncio.create_task(self._search(item)) for item in search_plan.searches
+            self.tasks.create_task(self._bounded_search(item, semaphore))
+            for item in search_plan.searches
         ]
-        results = []
-        for task in workflow.as_completed(tasks):
-            result = await task
-            if result is not None:
-                results.append(result)
-            num_completed += 1
-            workflow.logger.info(
+        fanout = await collect_search_results(
+            tasks,
+            quorum=self.config.search_quorum,
+            deadline_seconds=self.config.search_deadline_seconds,
+            on_complete=lambda num_completed: workflow.logger.info(
                 f"Completed search {num_completed}/{len(search_plan.searches)}"
+            ),
+        )
+        self.metrics.searches_planned += len(tasks)
+        self.metrics.searches_completed += fanout.completed
+        self.metrics.searches_used += len(fanout.results)
+        self.metrics.searches_cancelled += fanout.cancelled
+
+        if fanout.cancelled:
+            workflow.logger.info(
+                f"Search quorum or deadline reached, cancelled {fanout.cancelled} straggling searches"
             )
+        workflow.logger.info(
+            f"Completed searches, got {len(fanout.results)} results "
+            f"({self.search_cache_hits} served from the search cache so far)"
+        )
+        return fanout.results
 
-        workflow.logger.info(f"Completed all searches, got {len(results)} results")
-        return results
+    async def _bounded_search(
+        self, item: WebSearchItem, semaphore: asyncio.Semaphore
+    ) -> str | None:
+        """Perform a web search once the workflow's concurrency limit allows it"""
+        async with semaphore:
+            return await self._search(item)
 
     async def _search(self, item: WebSearchItem) -> str | None:
-        """Perform a single web search"""
+        """Perform a single web search, reusing cached results when available"""
+        result, from_cache = await run_cached_search(
+            item.query, lambda: self._run_search_agent(item)
+        )
+        if from_cache:
+            self.search_cache_hits += 1
+            workflow.logger.info(f"Search cache hit for '{item.query}'")
+        return result
+
+    async def _run_search_agent(self, item: WebSearchItem) -> str | None:
+        """Run the search agent for a single search term"""
         input_str = f"Search term: {item.query}\nReason for searching: {item.reason}"
         try:
+            if self.config.search_cascade:
+                output, escalated = await run_search_cascade(input_str)
+                self.metrics.cascade_searches += 1
+                self.metrics.cascade_escalations += escalated
+                return output
             result = await search_agent.run(input_str)
             return result.output
         except Exception as e:
@@ -183,12 +442,23 @@ class PydanticInteractiveResearchManager:
         """Generate the final research report"""
         workflow.logger.info("Writing research report")
 
+        search_results, condensed_chunks = await condense_search_results(
+            query, search_results, self.config
+        )
+        self.metrics.condensed_chunks += condensed_chunks
+
+        if self.config.sectioned_report:
+            report, num_sections = await write_sectioned_report(query, search_results)
+            self.metrics.report_sections += num_sections
+            return report
+
         input_str = (
             f"Original query: {query}\nSummarized search results: {search_results}"
         )
 
         # Generate markdown report
-        result = await writer_agent.run(input_str)
+        writer = writer_streaming_agent if self.config.stream_report else writer_agent
+        result = await writer.run(input_str)
         report_data = result.output
 
         workflow.logger.info("Research report completed")
@@ -196,9 +466,41 @@ class PydanticInteractiveResearchManager:
 
     async def _generate_pdf_report(self, report_data: ReportData) -> str | None:
         """Generate PDF from markdown report, return file path"""
+        if self.config.pdf_generation_mode == "agent":
+            return await self._generate_pdf_report_with_agent(report_data)
+
         try:
             workflow.logger.info("Generating PDF report")
 
+            title, markdown_body = split_report_title(report_data.markdown_report)
+            pdf_output = await workflow.execute_activity(
+                generate_pdf,
+                args=[markdown_body, title, StylingOptions()],
+                task_queue=PDF_TASK_QUEUE,
+                start_to_close_timeout=PDF_GENERATION_TIMEOUT,
+                heartbeat_timeout=PDF_HEARTBEAT_TIMEOUT,
+            )
+            if pdf_output.success:
+                workflow.logger.info(
+                    f"PDF generated successfully: {pdf_output.pdf_file_path}"
+                )
+                return pdf_output.pdf_file_path
+            else:
+                workflow.logger.warning(
+                    f"PDF generation failed: {pdf_output.error_message}"
+                )
+        except Exception as e:
+            workflow.logger.warning(f"PDF generation failed with exception: {e}")
+
+        return None
+
+    async def _generate_pdf_report_with_agent(
+        self, report_data: ReportData
+    ) -> str | None:
+        """Generate PDF with the PDF generator agent choosing title and styling"""
+        try:
+            workflow.logger.info("Generating PDF report with the PDF generator agent")
+
             pdf_result = await pdf_generator_agent.run(
                 f"Convert this markdown report to PDF:\n\n{report_data.markdown_report}"
             )
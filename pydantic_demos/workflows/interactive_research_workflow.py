@@ -1,17 +1,25 @@
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Callable
 
 from temporalio import workflow
 
 from pydantic_demos.workflows.interactive_research_manager import (
     PydanticInteractiveResearchManager,
 )
+from pydantic_demos.workflows.report_streaming import (
+    ReportChunk,
+    ReportProgress,
+    ReportStreamBuffer,
+)
 from pydantic_demos.workflows.research_agents.research_models import (
     ClarificationInput,
+    ResearchConfig,
     ResearchInteractionDict,
+    ResearchMetrics,
     SingleClarificationInput,
     UserQueryInput,
 )
+from pydantic_demos.workflows.research_agents.writer_agent import ReportData
 
 
 @dataclass
@@ -22,21 +30,48 @@ class InteractiveResearchResult:
     markdown_report: str
     follow_up_questions: list[str]
     pdf_file_path: str | None = None
+    metrics: ResearchMetrics = field(default_factory=ResearchMetrics)
+
+
+@dataclass
+class InteractiveResearchState:
+    """Session state carried over when the workflow continues as new"""
+
+    original_query: str | None = None
+    clarification_questions: list[str] = field(default_factory=list)
+    clarification_responses: dict[str, str] = field(default_factory=dict)
+    current_question_index: int = 0
+    report_data: ReportData | None = None
+    research_initialized: bool = False
+    research_completed: bool = False
+    metrics: ResearchMetrics = field(default_factory=ResearchMetrics)
+    pre_search_results: dict[str, str] = field(default_factory=dict)
 
 
 @workflow.defn
 class PydanticInteractiveResearchWorkflow:
-    def __init__(self) -> None:
-        self.research_manager = PydanticInteractiveResearchManager()
+    @workflow.init
+    def __init__(
+        self,
+        initial_query: str | None = None,
+        use_clarifications: bool = False,
+        config: ResearchConfig | None = None,
+        state: InteractiveResearchState | None = None,
+    ) -> None:
+        self.research_manager = PydanticInteractiveResearchManager(config)
+        state = state or InteractiveResearchState()
         # Simple instance variables instead of complex dataclass
-        self.original_query: str | None = None
-        self.clarification_questions: list[str] = []
-        self.clarification_responses: dict[str, str] = {}
-        self.current_question_index: int = 0
-        self.report_data: Any | None = None
-        self.research_completed: bool = False
+        self.original_query: str | None = state.original_query
+        self.clarification_questions: list[str] = state.clarification_questions
+        self.clarification_responses: dict[str, str] = state.clarification_responses
+        self.current_question_index: int = state.current_question_index
+        self.report_data: Any | None = state.report_data
+        self.research_completed: bool = state.research_completed
         self.workflow_ended: bool = False
-        self.research_initialized: bool = False
+        self.research_initialized: bool = state.research_initialized
+        self.research_manager.metrics = state.metrics
+        self.research_manager.pre_search_results = state.pre_search_results
+        self.report_stream = ReportStreamBuffer()
 
     def _build_result(
         self,
@@ -51,11 +86,73 @@ class PydanticInteractiveResearchWorkflow:
             markdown_report=report,
             follow_up_questions=questions or [],
             pdf_file_path=pdf_path,
+            metrics=self.research_manager.metrics,
+        )
+
+    def _should_continue_as_new(self) -> bool:
+        """Whether history has grown enough to start a fresh run"""
+        if self.research_manager.background_work_pending:
+            # Speculative searches would be lost with this run
+            return False
+        info = workflow.info()
+        config = self.research_manager.config
+        if info.is_continue_as_new_suggested():
+            return True
+        if (
+            config.continue_as_new_history_length is not None
+            and info.get_current_history_length()
+            >= config.continue_as_new_history_length
+        ):
+            return True
+        return (
+            config.continue_as_new_history_bytes is not None
+            and info.get_current_history_size() >= config.continue_as_new_history_bytes
+        )
+
+    async def _continue_as_new(self, still_idle: Callable[[], bool]) -> None:
+        """
+        Carry the session state into a new run with an empty history.
+
+        Returns instead if, once in-flight updates have finished, ``still_idle``
+        is false or background work started, so the caller handles the new state.
+        """
+        # Let in-flight updates finish so their callers get a response
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        if (
+            self.workflow_ended
+            or not still_idle()
+            or not self._should_continue_as_new()
+        ):
+            return
+        workflow.logger.info(
+            f"Continuing as new after {workflow.info().get_current_history_length()} history events"
+        )
+        workflow.continue_as_new(
+            args=[
+                None,
+                False,
+                self.research_manager.config,
+                InteractiveResearchState(
+                    original_query=self.original_query,
+                    clarification_questions=self.clarification_questions,
+                    clarification_responses=self.clarification_responses,
+                    current_question_index=self.current_question_index,
+                    report_data=self.report_data,
+                    research_initialized=self.research_initialized,
+                    research_completed=self.research_completed,
+                    metrics=self.research_manager.metrics,
+                    pre_search_results=self.research_manager.pre_search_results,
+                ),
+            ]
         )
 
     @workflow.run
     async def run(
-        self, initial_query: str | None = None, use_clarifications: bool = False
+        self,
+        initial_query: str | None = None,
+        use_clarifications: bool = False,
+        config: ResearchConfig | None = None,
+        state: InteractiveResearchState | None = None,
     ) -> InteractiveResearchResult:
         """
         Run research workflow - long-running interactive workflow with clarifying questions
@@ -63,12 +160,20 @@ class PydanticInteractiveResearchWorkflow:
         Args:
             initial_query: Optional initial research query (for backward compatibility)
             use_clarifications: If True, enables interactive clarifying questions (for backward compatibility)
+            config: Optional tuning options for the research pipeline
+            state: Session state carried over from a previous run when continuing as new
         """
         if initial_query and not use_clarifications:
             # Simple direct research mode - backward compatibility
-            report_data = await self.research_manager._run_direct(initial_query)
-            pdf_file_path = await self.research_manager._generate_pdf_report(
-                report_data
+            report_data = await self.research_manager.tasks.run(
+                self.research_manager._run_direct(initial_query)
+            )
+            if report_data is None:
+                return self._build_result(
+                    "Research ended by user", "Research workflow ended by user"
+                )
+            pdf_file_path = await self.research_manager.tasks.run(
+                self.research_manager._generate_pdf_report(report_data)
             )
             return self._build_result(
                 report_data.short_summary,
@@ -86,6 +191,7 @@ class PydanticInteractiveResearchWorkflow:
                 lambda: self.workflow_ended
                 or self.research_completed
                 or self.research_initialized
+                or self._should_continue_as_new()
             )
 
             # If workflow was signaled to end, exit gracefully
@@ -97,8 +203,8 @@ class PydanticInteractiveResearchWorkflow:
             # If research has been completed, return results
             if self.research_completed and self.report_data:
                 # Generate PDF if we have report data
-                pdf_file_path = await self.research_manager._generate_pdf_report(
-                    self.report_data
+                pdf_file_path = await self.research_manager.tasks.run(
+                    self.research_manager._generate_pdf_report(self.report_data)
                 )
                 return self._build_result(
                     self.report_data.short_summary,
@@ -107,6 +213,12 @@ class PydanticInteractiveResearchWorkflow:
                     pdf_file_path,
                 )
 
+            # Still waiting for start_research, but history has grown too large
+            if not self.research_initialized:
+                await self._continue_as_new(lambda: not self.research_initialized)
+                # start_research ran while in-flight updates finished
+                continue
+
             # If research is initialized but not completed, handle the clarification flow
             if self.research_initialized and not self.research_completed:
 
@@ -117,6 +229,7 @@ class PydanticInteractiveResearchWorkflow:
                         lambda: self.workflow_ended
                         or len(self.clarification_responses)
                         >= len(self.clarification_questions)
+                        or self._should_continue_as_new()
                     )
 
                     if self.workflow_ended:
@@ -124,23 +237,40 @@ class PydanticInteractiveResearchWorkflow:
                             "Research ended by user", "Research workflow ended by user"
                         )
 
-                    # Complete research with clarifications
+                    if len(self.clarification_responses) < len(
+                        self.clarification_questions
+                    ):
+                        await self._continue_as_new(
+                            lambda: len(self.clarification_responses)
+                            < len(self.clarification_questions)
+                        )
+                        # The last answers arrived while in-flight updates finished
+                        continue
+
+                    # Complete research with clarifications; None if the
+                    # workflow was ended meanwhile, which the loop then handles
                     if self.original_query:  # Type guard to ensure it's not None
-                        self.report_data = await self.research_manager.run_with_clarifications_complete(
-                            self.original_query,
-                            self.clarification_questions,
-                            self.clarification_responses,
+                        self.report_data = await self.research_manager.tasks.run(
+                            self.research_manager.run_with_clarifications_complete(
+                                self.original_query,
+                                self.clarification_questions,
+                                self.clarification_responses,
+                            )
                         )
 
                     self.research_completed = True
                     continue
 
-                # If we already have report data (from direct research), mark as completed
-                elif self.report_data is not None:
+                # No clarifications needed: research runs here rather than in
+                # start_research, so that update returns as soon as triage is done
+                elif self.original_query:
+                    self.report_data = await self.research_manager.tasks.run(
+                        self.research_manager._run_direct(self.original_query)
+                    )
                     self.research_completed = True
                     continue
 
-                # If no clarification questions and no report data, it means research failed
+                # Initialized without a query means research failed to start
                 return self._build_result(
                     "No research completed", "Research failed to start properly"
                 )
@@ -187,9 +317,22 @@ class PydanticInteractiveResearchWorkflow:
             research_completed=self.research_completed,
         )
 
+    @workflow.query
+    def get_report_progress(self, cursor: int = 0) -> ReportProgress:
+        """Get the report text generated so far, starting at ``cursor``"""
+        return self.report_stream.read(
+            cursor, done=self.research_completed or self.workflow_ended
+        )
+
     @workflow.update
     async def start_research(self, input: UserQueryInput) -> ResearchInteractionDict:
-        """Start a new research session with clarifying questions flow"""
+        """
+        Start a new research session with clarifying questions flow.
+
+        Returns once triage has run and any clarifying questions are ready. The
+        research itself runs in the main workflow loop; wait for the workflow
+        result to get the report.
+        """
         workflow.logger.info(f"Starting research for query: '{input.query}'")
         self.original_query = input.query
 
@@ -201,11 +344,6 @@ class PydanticInteractiveResearchWorkflow:
         if result.needs_clarifications:
             # Set up clarifying questions for client to see immediately
             self.clarification_questions = result.questions or []
-        else:
-            # No clarifications needed, store the research data but let main loop complete it
-            if result.report_data is not None:
-                self.report_data = result.report_data
-            # If research failed, main loop will handle fallback
 
         # Mark research as initialized so main loop can proceed
         self.research_initialized = True
@@ -268,7 +406,15 @@ class PydanticInteractiveResearchWorkflow:
         if not self.clarification_questions:
             raise ValueError("Not awaiting clarifications")
 
+    @workflow.signal
+    def report_progress(self, chunk: ReportChunk) -> None:
+        """Receive partial report markdown from the writer activity"""
+        self.report_stream.apply(chunk)
+
     @workflow.signal
     async def end_workflow_signal(self) -> None:
-        """Signal to end the workflow"""
+        """Signal to end the workflow, cancelling any research still in progress"""
         self.workflow_ended = True
+        cancelled = self.research_manager.cancel_outstanding()
+        if cancelled:
+            workflow.logger.info(f"Cancelled {cancelled} in-flight research tasks")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Generic, TypeVar
+
+from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import activity, workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
+
+OutputT = TypeVar("OutputT")
+
+LOCAL_AGENT_TIMEOUT = timedelta(seconds=10)
+
+
+class LocalAgentRunner(Generic[OutputT]):
+    """
+    Runs a small agent's whole run inside a single local activity.
+
+    Local activities execute on the worker running the workflow without going
+    through the task queue, which removes the activity dispatch latency that
+    dominates short structured calls. The run gets one attempt with a tight
+    timeout; if it fails, it is repeated through the agent's ``TemporalAgent``
+    as regular activities. Register ``activity`` on the workflow worker.
+    """
+
+    def __init__(self, temporal_agent: TemporalAgent[Any, OutputT]) -> None:
+        self.temporal_agent = temporal_agent
+        self.name = temporal_agent.name
+        self.output_type = temporal_agent.output_type
+        agent = temporal_agent.wrapped
+
+        async def run_agent(prompt: str) -> Any:
+            result = await agent.run(prompt)
+            return result.output
+
+        # Set the return type so Temporal deserializes the agent's output type
+        run_agent.__annotations__["return"] = self.output_type
+        self.activity = activity.defn(name=f"{self.name}__local_run")(run_agent)
+
+    async def run(
+        self,
+        prompt: str,
+        *,
+        local: bool = True,
+        timeout: timedelta = LOCAL_AGENT_TIMEOUT,
+    ) -> OutputT:
+        """Run the agent from a workflow, as a local activity when ``local`` is set"""
+        if local:
+            try:
+                return await workflow.execute_local_activity(
+                    self.activity,
+                    prompt,
+                    start_to_close_timeout=timeout,
+                    retry_policy=RetryPolicy(maximum_attempts=1),
+                    result_type=self.output_type,
+                )
+            except ActivityError as e:
+                workflow.logger.warning(
+                    f"Local run of {self.name} failed, falling back to activities: {e}"
+                )
+
+        result = await self.temporal_agent.run(prompt)
+        return result.output
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable
+
+from pydantic_ai import RunContext
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import (
+    KnownModelName,
+    Model,
+    ModelRequestParameters,
+    StreamedResponse,
+)
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import Usage
+from pydantic_core import to_json
+
+from pydantic_demos.workflows.activity_heartbeat import heartbeat_while_running
+from pydantic_demos.workflows.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    is_rate_limit_error,
+)
+from pydantic_demos.workflows.circuit_breaker import (
+    CircuitOpenError,
+    get_circuit_breakers,
+)
+from pydantic_demos.workflows.hedging import HedgingPolicy
+from pydantic_demos.workflows.rate_limiter import get_rate_limiter
+
+# Response tokens assumed when a request does not set max_tokens
+DEFAULT_RESPONSE_TOKEN_ESTIMATE = 1024
+
+
+async def _ignore_usage(usage: Usage) -> None:
+    pass
+
+
+class ManagedModel(WrapperModel):
+    """
+    Model wrapper that applies worker-wide request policies.
+
+    ``TemporalAgent`` calls the agent's model from inside its model activities,
+    so anything done here runs on the worker and is shared by every workflow
+    that uses the agent. Requests heartbeat the model activity so that a
+    workflow cancelling it aborts the provider request, and wait for the
+    host-wide rate limit budget (see ``rate_limiter``) before being sent.
+    With a ``hedging`` policy, slow non-streaming requests are duplicated.
+
+    Every request is tracked by its model's circuit breaker (see
+    ``circuit_breaker``). Non-streaming requests slower than
+    ``latency_slo_seconds`` count as breaker failures; without an SLO only
+    errors do. While the breaker is open, requests go straight to
+    ``fallback`` if one is set, and fail fast with ``CircuitOpenError`` if not.
+    """
+
+    def __init__(
+        self,
+        wrapped: Model | KnownModelName,
+        *,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        hedging: HedgingPolicy | None = None,
+        fallback: ManagedModel | None = None,
+        latency_slo_seconds: float | None = None,
+    ) -> None:
+        super().__init__(wrapped)
+        self.limiter = limiter
+        self.hedging = hedging
+        self.fallback = fallback
+        self.latency_slo_seconds = latency_slo_seconds
+
+    def _breaker_open(self) -> bool:
+        return get_circuit_breakers().get(self.model_name).rejects_requests()
+
+    def _concurrency_slot(self) -> AsyncContextManager[None]:
+        if self.limiter is None:
+            return nullcontext()
+        return self.limiter.slot()
+
+    @staticmethod
+    def _estimate_tokens(
+        messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> int:
+        """Rough token count: ~4 bytes per prompt token plus the response budget"""
+        max_tokens = (model_settings or {}).get("max_tokens")
+        return len(to_json(messages)) // 4 + (
+            max_tokens or DEFAULT_RESPONSE_TOKEN_ESTIMATE
+        )
+
+    @asynccontextmanager
+    async def _rate_limited(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+    ) -> AsyncIterator[Callable[[Usage], Awaitable[None]]]:
+        """Wait for rate limit budget; yields a callback reporting actual usage"""
+        rate_limiter = get_rate_limiter()
+        if rate_limiter is None:
+            yield _ignore_usage
+            return
+
+        estimated = self._estimate_tokens(messages, model_settings)
+        await rate_limiter.acquire(self.model_name, estimated)
+
+        async def record_usage(usage: Usage) -> None:
+            if usage.total_tokens is not None:
+                await rate_limiter.record_usage(
+                    self.model_name, estimated, usage.total_tokens
+                )
+
+        try:
+            yield record_usage
+        except Exception as e:
+            if is_rate_limit_error(e):
+                await rate_limiter.record_throttled(self.model_name)
+            raise
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        async with heartbeat_while_running():
+            if self.hedging is None:
+                return await self._send(
+                    messages, model_settings, model_request_parameters
+                )
+            return await self.hedging.run(
+                lambda: self._send(messages, model_settings, model_request_parameters)
+            )
+
+    async def _send(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        """Send one request; a hedged request calls this once per attempt"""
+        if self.fallback is not None and self._breaker_open():
+            return await self.fallback._send(
+                messages, model_settings, model_request_parameters
+            )
+        breaker = get_circuit_breakers().get(self.model_name)
+        try:
+            async with self._rate_limited(
+                messages, model_settings
+            ) as record_usage, self._concurrency_slot():
+                async with breaker.track(self.latency_slo_seconds):
+                    response = await self.wrapped.request(
+                        messages, model_settings, model_request_parameters
+                    )
+                await record_usage(response.usage)
+                return response
+        except CircuitOpenError:
+            # The breaker opened while this request waited for budget
+            if self.fallback is None:
+                raise
+            return await self.fallback._send(
+                messages, model_settings, model_request_parameters
+            )
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        if self.fallback is not None and self._breaker_open():
+            async with self.fallback.request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response_stream:
+                yield response_stream
+            return
+
+        breaker = get_circuit_breakers().get(self.model_name)
+        async with heartbeat_while_running(), self._rate_limited(
+            messages, model_settings
+        ) as record_usage, self._concurrency_slot(), breaker.track():
+            async with super().request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response_stream:
+                yield response_stream
+            await record_usage(response_stream.usage())
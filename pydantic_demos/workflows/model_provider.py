@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass
+
+import httpx
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConnectionPoolStats:
+    """Snapshot of the shared provider connection pool"""
+
+    connections: int
+    idle: int
+    active: int
+    http2: int
+    queued_requests: int
+
+
+@functools.cache
+def shared_http_client() -> httpx.AsyncClient:
+    """
+    The keep-alive connection pool used for every model request in the process.
+
+    Sized from ``OPENAI_HTTP_MAX_CONNECTIONS``, ``OPENAI_HTTP_MAX_KEEPALIVE`` and
+    ``OPENAI_HTTP_KEEPALIVE_EXPIRY``. HTTP/2 is used when the ``h2`` package is
+    installed, so concurrent requests share a few multiplexed connections.
+    """
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=int(os.environ.get("OPENAI_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(
+                os.environ.get("OPENAI_HTTP_MAX_KEEPALIVE", "20")
+            ),
+            keepalive_expiry=float(
+                os.environ.get("OPENAI_HTTP_KEEPALIVE_EXPIRY", "60")
+            ),
+        ),
+        timeout=httpx.Timeout(timeout=600, connect=5),
+    )
+
+
+@functools.cache
+def shared_provider() -> OpenAIProvider:
+    """The OpenAI provider shared by all agents in the process"""
+    return OpenAIProvider(http_client=shared_http_client())
+
+
+def openai_model(model_name: str) -> OpenAIModel:
+    """An OpenAI model that sends its requests through the shared provider"""
+    return OpenAIModel(model_name, provider=shared_provider())
+
+
+def connection_pool_stats() -> ConnectionPoolStats:
+    """Read the shared pool's state; all zeros if httpx internals change"""
+    pool = getattr(getattr(shared_http_client(), "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return ConnectionPoolStats(
+        connections=len(connections),
+        idle=idle,
+        active=len(connections) - idle,
+        http2=sum(1 for connection in connections if "HTTP/2" in connection.info()),
+        queued_requests=sum(
+            1 for request in getattr(pool, "_requests", []) if request.is_queued()
+        ),
+    )
+
+
+async def warm_up_connections(count: int) -> None:
+    """
+    Open ``count`` pooled connections before the worker starts polling.
+
+    Each connection pays its TCP and TLS setup here instead of on the first
+    model request. Failures are logged: the worker still starts and the
+    connections are opened on demand.
+    """
+    if count <= 0:
+        return
+    client = shared_provider().client
+    results = await asyncio.gather(
+        *(client.models.list() for _ in range(count)), return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures:
+        logger.warning(
+            f"Provider warm-up: {len(failures)}/{count} requests failed: {failures[0]}"
+        )
+    stats = connection_pool_stats()
+    logger.info(
+        f"Provider warm-up: {stats.connections} connections open "
+        f"({stats.http2} HTTP/2)"
+    )
@@ -1,11 +1,16 @@
+import asyncio
 import os
+import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 import markdown
 from pydantic import BaseModel
 from temporalio import activity
 
+from pydantic_demos.workflows.activity_heartbeat import heartbeat_while_running
+from pydantic_demos.workflows.pdf_output_store import PdfOutputStore
+
 # Set library path for WeasyPrint if not already set
 if not os.environ.get("DYLD_FALLBACK_LIBRARY_PATH"):
     os.environ["DYLD_FALLBACK_LIBRARY_PATH"] = "/opt/homebrew/lib"
@@ -19,6 +24,17 @@ except (ImportError, OSError) as e:
     WEASYPRINT_AVAILABLE = False
     print(f"WeasyPrint not available: {e}")
 
+# Rendering is CPU-bound, so it runs on a separate task queue whose worker
+# limits concurrent activities to the size of the render process pool
+PDF_TASK_QUEUE = "pydantic-ai-pdf-task-queue"
+
+_render_pool: Any = None
+_output_store = PdfOutputStore()
+
+# Per-process renderer state, populated by _init_renderer in pool processes
+_font_config: Any = None
+_default_stylesheet: Any = None
+
 
 class StylingOptions(BaseModel):
     """Styling options for PDF generation"""
@@ -34,6 +50,25 @@ class PDFGenerationResult:
     error_message: Optional[str] = None
 
 
+def split_report_title(
+    markdown_content: str, default_title: str = "Research Report"
+) -> tuple[str, str]:
+    """
+    Derive a PDF title from the report's first heading.
+
+    Returns the title and the markdown to render. When the report starts with
+    that heading it is removed from the body so it is not rendered twice.
+    """
+    match = re.search(r"^#{1,6}\s+(.+?)\s*#*\s*$", markdown_content, re.MULTILINE)
+    if not match:
+        return default_title, markdown_content
+
+    title = match.group(1).strip()
+    if markdown_content[: match.start()].strip():
+        return title, markdown_content
+    return title, markdown_content[match.end() :].lstrip("\n")
+
+
 @activity.defn
 async def generate_pdf(
     markdown_content: str,
@@ -58,6 +93,17 @@ async def generate_pdf(
             error_message="weasyprint library not available",
         )
 
+    store = _output_store
+    key = store.key(
+        markdown_content,
+        title,
+        styling_options.model_dump() if styling_options else None,
+    )
+    # The store touches and scans the disk, so keep it off the event loop
+    existing_path = await asyncio.to_thread(store.get, key)
+    if existing_path is not None:
+        return PDFGenerationResult(pdf_file_path=str(existing_path), success=True)
+
     try:
         # Convert markdown to HTML
         html_content = markdown.markdown(
@@ -71,10 +117,6 @@ async def generate_pdf(
         <head>
             <meta charset="UTF-8">
             <title>{title}</title>
-            <style>
-                {_get_default_css()}
-                {_get_custom_css(styling_options)}
-            </style>
         </head>
         <body>
             <div class="container">
@@ -87,21 +129,21 @@ async def generate_pdf(
         </html>
         """
 
-        # Generate PDF and save to file
-        import datetime
-        from pathlib import Path
-
-        # Create pdf_output directory if it doesn't exist
-        pdf_output_dir = Path("pdf_output")
-        pdf_output_dir.mkdir(exist_ok=True)
-
-        # Create a unique filename with timestamp
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"research_report_{timestamp}.pdf"
-        pdf_path = pdf_output_dir / filename
-
-        # Generate PDF directly to file
-        weasyprint.HTML(string=full_html).write_pdf(str(pdf_path))
+        # Render in the process pool so the worker's event loop stays responsive,
+        # heartbeating so the activity notices if its workflow cancels it
+        temp_path = store.temp_path(key)
+        try:
+            async with heartbeat_while_running():
+                await asyncio.get_running_loop().run_in_executor(
+                    get_pdf_render_pool(),
+                    _render_pdf,
+                    full_html,
+                    _get_custom_css(styling_options),
+                    str(temp_path),
+                )
+            pdf_path = await asyncio.to_thread(store.commit, temp_path, key)
+        finally:
+            temp_path.unlink(missing_ok=True)
 
         return PDFGenerationResult(pdf_file_path=str(pdf_path), success=True)
 
@@ -111,6 +153,81 @@ async def generate_pdf(
         )
 
 
+def configure_pdf_output_store(root: str, max_bytes: int) -> PdfOutputStore:
+    """Set where rendered PDFs are stored and how much disk they may use"""
+    global _output_store
+    _output_store = PdfOutputStore(root, max_bytes)
+    return _output_store
+
+
+def configure_pdf_render_pool(max_workers: int | None = None) -> Any:
+    """
+    Create the process pool used to render PDFs.
+
+    Each pool process imports WeasyPrint and parses the default stylesheet and
+    font configuration once at startup, so renders only pay for the document
+    itself. Defaults to one process per available core.
+    """
+    global _render_pool
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False)
+    _render_pool = ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        # Forking a worker that already runs Temporal's threads is unsafe
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_renderer,
+    )
+    return _render_pool
+
+
+def get_pdf_render_pool() -> Any:
+    """Get the PDF render pool, creating a default one if needed"""
+    return _render_pool if _render_pool is not None else configure_pdf_render_pool()
+
+
+def shutdown_pdf_render_pool() -> None:
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def _init_renderer() -> None:
+    """Warm up WeasyPrint, fonts and the default stylesheet in a pool process"""
+    global _font_config, _default_stylesheet
+    if weasyprint is None:
+        return
+
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    _default_stylesheet = weasyprint.CSS(
+        string=_get_default_css(), font_config=_font_config
+    )
+    # Render a tiny document so font discovery happens before the first request
+    weasyprint.HTML(string="<p>warm-up</p>").write_pdf(
+        stylesheets=[_default_stylesheet], font_config=_font_config
+    )
+
+
+def _render_pdf(full_html: str, custom_css: str, pdf_path: str) -> None:
+    """Render HTML to a PDF file using the warm per-process renderer state"""
+    if weasyprint is None:
+        raise RuntimeError("weasyprint library not available")
+    if _default_stylesheet is None:
+        _init_renderer()
+
+    stylesheets = [_default_stylesheet]
+    if custom_css:
+        stylesheets.append(weasyprint.CSS(string=custom_css, font_config=_font_config))
+    weasyprint.HTML(string=full_html).write_pdf(
+        pdf_path, stylesheets=stylesheets, font_config=_font_config
+    )
+
+
 def _get_default_css() -> str:
     """Get default CSS styling for PDF generation."""
     return """
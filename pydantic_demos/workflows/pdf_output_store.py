@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+
+class PdfOutputStore:
+    """
+    Content-addressed store for rendered PDFs.
+
+    Files are named after a hash of everything that affects the rendered
+    output, so identical requests map to the same file and concurrent renders
+    of different reports can never collide. Renders are written to a temporary
+    file and atomically moved into place. When the store grows beyond
+    ``max_bytes`` the least recently used files are deleted. All methods do
+    blocking disk I/O, so async callers should run them in a thread.
+    """
+
+    def __init__(
+        self, root: str | os.PathLike[str] = "pdf_output", max_bytes: int = 512 << 20
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(markdown_content: str, title: str, styling: dict[str, Any] | None) -> str:
+        """Hash of the inputs that determine the rendered PDF"""
+        material = json.dumps(
+            {"markdown": markdown_content, "title": title, "styling": styling},
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"research_report_{key[:32]}.pdf"
+
+    def get(self, key: str) -> Path | None:
+        """Return the stored PDF for ``key``, marking it as recently used"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def temp_path(self, key: str) -> Path:
+        """A unique temporary path in the store to render into"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f".{key[:32]}.{uuid.uuid4().hex}.tmp"
+
+    def commit(self, temp_path: Path, key: str) -> Path:
+        """Atomically move a finished render into place and enforce the size bound"""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Path | None = None) -> int:
+        """Delete least recently used PDFs until the store fits in ``max_bytes``"""
+        files = []
+        for path in self.root.glob("research_report_*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class ModelRateLimit:
+    """Organization budget for one model; None leaves a dimension unlimited"""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters of this process's use of the shared budgets"""
+
+    acquired: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    throttled: int = 0
+
+
+def default_rate_limit_db() -> str:
+    """The SQLite file worker processes share budgets through by default"""
+    # Resolved on demand: the temp dir lookup is not allowed in workflow sandboxes
+    import tempfile
+
+    return os.path.join(tempfile.gettempdir(), "pydantic-demos-rate-limits.sqlite")
+
+
+def parse_rate_limits(spec: str) -> dict[str, ModelRateLimit]:
+    """
+    Parse limits written as ``model=RPM:TPM`` pairs separated by commas.
+
+    Either number may be left empty, e.g. ``gpt-4o=500:30000,o3-mini=:200000``.
+    """
+    limits: dict[str, ModelRateLimit] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        model_name, _, budget = entry.partition("=")
+        rpm, _, tpm = budget.partition(":")
+        limits[model_name.strip()] = ModelRateLimit(
+            requests_per_minute=float(rpm) if rpm.strip() else None,
+            tokens_per_minute=float(tpm) if tpm.strip() else None,
+        )
+    return limits
+
+
+class SharedRateLimiter:
+    """
+    Per-model request and token buckets shared by every worker process on a host.
+
+    Bucket levels live in a SQLite file, so all processes opening the same
+    ``sqlite_path`` draw from one budget. Each bucket holds at most one
+    minute's allowance and refills continuously. Requests wait until enough
+    budget is available rather than being sent to fail with a 429. Token
+    counts are estimates when a request starts and are corrected with the
+    response's actual usage. SQLite calls run in a thread, since waiting for
+    another process's write lock would otherwise block the event loop.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: str,
+        limits: dict[str, ModelRateLimit],
+        max_poll_seconds: float = 1.0,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self.limits = limits
+        self.max_poll_seconds = max_poll_seconds
+        self._stats = RateLimiterStats()
+        self._db: Any = None
+        # One connection per process, used by one transaction at a time
+        self._db_lock = threading.Lock()
+
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(**vars(self._stats))
+
+    async def acquire(self, model_name: str, tokens: int) -> None:
+        """Wait until the model's budget covers one request of ``tokens`` tokens"""
+        limit = self.limits.get(model_name)
+        if limit is None:
+            return
+        started = time.monotonic()
+        waited = False
+        while (
+            wait := await asyncio.to_thread(
+                self._try_acquire, model_name, limit, tokens
+            )
+        ) > 0:
+            waited = True
+            await asyncio.sleep(min(wait, self.max_poll_seconds))
+        self._stats.acquired += 1
+        if waited:
+            self._stats.waited += 1
+            self._stats.wait_seconds += time.monotonic() - started
+
+    async def record_usage(self, model_name: str, estimated: int, actual: int) -> None:
+        """Return or charge the difference between estimated and actual tokens"""
+        limit = self.limits.get(model_name)
+        if limit is None or limit.tokens_per_minute is None or actual == estimated:
+            return
+        await asyncio.to_thread(
+            self._transaction,
+            model_name,
+            [("tokens", limit.tokens_per_minute)],
+            lambda levels: {"tokens": levels["tokens"] + estimated - actual},
+        )
+
+    async def record_throttled(self, model_name: str) -> None:
+        """Empty the model's request bucket after a 429 so every process backs off"""
+        self._stats.throttled += 1
+        limit = self.limits.get(model_name)
+        if limit is None or limit.requests_per_minute is None:
+            return
+        await asyncio.to_thread(
+            self._transaction,
+            model_name,
+            [("requests", limit.requests_per_minute)],
+            lambda levels: {"requests": min(levels["requests"], 0.0)},
+        )
+
+    def _try_acquire(
+        self, model_name: str, limit: ModelRateLimit, tokens: int
+    ) -> float:
+        """Take the budget if available; otherwise return the seconds to wait"""
+        needs = {
+            kind: (per_minute, amount)
+            for kind, per_minute, amount in (
+                ("requests", limit.requests_per_minute, 1),
+                ("tokens", limit.tokens_per_minute, tokens),
+            )
+            if per_minute is not None
+        }
+        wait = 0.0
+
+        def take(levels: dict[str, float]) -> dict[str, float]:
+            nonlocal wait
+            for kind, (per_minute, amount) in needs.items():
+                # A request larger than a whole bucket waits for a full bucket
+                missing = min(amount, per_minute) - levels[kind]
+                wait = max(wait, missing * 60 / per_minute)
+            if wait > 0:
+                return {}
+            return {kind: levels[kind] - amount for kind, (_, amount) in needs.items()}
+
+        self._transaction(
+            model_name,
+            [(kind, per_minute) for kind, (per_minute, _) in needs.items()],
+            take,
+        )
+        return wait
+
+    def _transaction(
+        self,
+        model_name: str,
+        buckets: list[tuple[str, float]],
+        update: Callable[[dict[str, float]], dict[str, float]],
+    ) -> None:
+        """Refill ``buckets``, apply ``update`` to their levels and save the result"""
+        with self._db_lock:
+            db = self._connect()
+            now = time.time()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                levels: dict[str, float] = {}
+                for kind, per_minute in buckets:
+                    row = db.execute(
+                        "SELECT level, updated_at FROM rate_buckets "
+                        "WHERE model = ? AND kind = ?",
+                        (model_name, kind),
+                    ).fetchone()
+                    if row is None:
+                        levels[kind] = per_minute
+                    else:
+                        refill = max(0.0, now - row[1]) * per_minute / 60
+                        levels[kind] = min(per_minute, row[0] + refill)
+                for kind, level in update(levels).items():
+                    db.execute(
+                        "INSERT OR REPLACE INTO rate_buckets "
+                        "(model, kind, level, updated_at) VALUES (?, ?, ?, ?)",
+                        (model_name, kind, level, now),
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _connect(self) -> Any:
+        if self._db is None:
+            import sqlite3
+
+            # Autocommit mode so transactions are started explicitly with
+            # BEGIN IMMEDIATE, which serializes processes on the write lock
+            self._db = sqlite3.connect(
+                self.sqlite_path,
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets (model TEXT NOT NULL, "
+                "kind TEXT NOT NULL, level REAL NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (model, kind))"
+            )
+        return self._db
+
+
+_rate_limiter: SharedRateLimiter | None = None
+
+
+def configure_rate_limiter(
+    sqlite_path: str, limits: dict[str, ModelRateLimit]
+) -> SharedRateLimiter | None:
+    """Set the budgets model requests in this process wait for; none disables it"""
+    global _rate_limiter
+    _rate_limiter = SharedRateLimiter(sqlite_path, limits) if limits else None
+    return _rate_limiter
+
+
+def get_rate_limiter() -> SharedRateLimiter | None:
+    return _rate_limiter
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from typing import Any, Union
+
+from pydantic_ai import RunContext
+from pydantic_ai.messages import (
+    AgentStreamEvent,
+    HandleResponseEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolCallPart,
+    ToolCallPartDelta,
+)
+from pydantic_core import from_json
+from temporalio import activity, workflow
+
+REPORT_PROGRESS_SIGNAL = "report_progress"
+REPORT_PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+@dataclass
+class ReportChunk:
+    """A piece of partially generated report sent from the writer activity"""
+
+    stream_id: str
+    offset: int
+    text: str
+
+
+@dataclass
+class ReportProgress:
+    """Buffered report text from a cursor offset"""
+
+    text: str
+    cursor: int
+    generation: int
+    done: bool
+
+
+class ReportStreamBuffer:
+    """
+    Workflow-side buffer of the report being written.
+
+    Each writer activity attempt streams under its own ``stream_id``; when a
+    new stream starts (for example after an activity retry) the buffer is
+    reset and ``generation`` is bumped so clients know to start over.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.stream_id: str | None = None
+        self.generation = 0
+
+    def apply(self, chunk: ReportChunk) -> None:
+        if chunk.stream_id != self.stream_id:
+            self.stream_id = chunk.stream_id
+            self.text = ""
+            self.generation += 1
+        if chunk.offset > len(self.text):
+            return
+        self.text = self.text[: chunk.offset] + chunk.text
+
+    def read(self, cursor: int, done: bool) -> ReportProgress:
+        return ReportProgress(
+            text=self.text[cursor:],
+            cursor=len(self.text),
+            generation=self.generation,
+            done=done,
+        )
+
+
+class _ReportTextExtractor:
+    """Accumulates streamed parts and extracts the markdown written so far"""
+
+    def __init__(self) -> None:
+        self._text_parts: dict[int, str] = {}
+        self._tool_args: dict[int, str] = {}
+
+    def feed(self, event: Union[AgentStreamEvent, HandleResponseEvent]) -> None:
+        if isinstance(event, PartStartEvent):
+            if isinstance(event.part, TextPart):
+                self._text_parts[event.index] = event.part.content
+            elif isinstance(event.part, ToolCallPart):
+                self._tool_args[event.index] = (
+                    event.part.args
+                    if isinstance(event.part.args, str)
+                    else event.part.args_as_json_str()
+                )
+        elif isinstance(event, PartDeltaEvent):
+            if isinstance(event.delta, TextPartDelta):
+                self._text_parts[event.index] = (
+                    self._text_parts.get(event.index, "") + event.delta.content_delta
+                )
+            elif isinstance(event.delta, ToolCallPartDelta) and isinstance(
+                event.delta.args_delta, str
+            ):
+                self._tool_args[event.index] = (
+                    self._tool_args.get(event.index, "") + event.delta.args_delta
+                )
+
+    @property
+    def markdown(self) -> str:
+        # Structured output arrives as partial JSON tool arguments
+        for args in self._tool_args.values():
+            try:
+                parsed = from_json(args, allow_partial="trailing-strings")
+            except ValueError:
+                continue
+            if isinstance(parsed, dict) and isinstance(
+                parsed.get("markdown_report"), str
+            ):
+                return parsed["markdown_report"]
+        return "".join(self._text_parts[index] for index in sorted(self._text_parts))
+
+
+async def stream_report_progress(
+    ctx: RunContext[Any],
+    event_stream: AsyncIterable[Union[AgentStreamEvent, HandleResponseEvent]],
+) -> None:
+    """
+    Event stream handler that pushes partial report markdown to the workflow.
+
+    Runs inside the model activity and signals the workflow that started it
+    with the new text at most every ``REPORT_PROGRESS_INTERVAL_SECONDS``.
+    """
+    # The event_stream_handler may get invoked from the Workflow sandbox where IO is not allowed.
+    # We only want to stream when it's invoked from an Activity.
+    if workflow.in_workflow():
+        return
+
+    info = activity.info()
+    handle = activity.client().get_workflow_handle(info.workflow_id)
+    stream_id = f"{info.activity_id}-{info.attempt}"
+    extractor = _ReportTextExtractor()
+    sent = 0
+    last_sent_at = time.monotonic()
+
+    async def publish() -> None:
+        nonlocal sent, last_sent_at
+        markdown = extractor.markdown
+        last_sent_at = time.monotonic()
+        if len(markdown) <= sent:
+            return
+        try:
+            await handle.signal(
+                REPORT_PROGRESS_SIGNAL,
+                ReportChunk(stream_id=stream_id, offset=sent, text=markdown[sent:]),
+            )
+            sent = len(markdown)
+        except Exception as e:
+            activity.logger.warning(f"Failed to publish report progress: {e}")
+
+    async for event in event_stream:
+        extractor.feed(event)
+        if time.monotonic() - last_sent_at >= REPORT_PROGRESS_INTERVAL_SECONDS:
+            await publish()
+    await publish()
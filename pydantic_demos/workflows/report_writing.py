@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+
+from temporalio import workflow
+
+from pydantic_demos.workflows.research_agents.condenser_agent import (
+    temporal_agent as condenser_agent,
+)
+from pydantic_demos.workflows.research_agents.research_models import ResearchConfig
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    ReportData,
+    ReportOutline,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    outline_temporal_agent as outline_agent,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    section_temporal_agent as section_agent,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    summary_temporal_agent as summary_agent,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token for English text)"""
+    return len(text) // 4
+
+
+def chunk_search_results(search_results: list[str], chunk_size: int) -> list[list[str]]:
+    """Split search results into consecutive chunks of at most ``chunk_size``"""
+    chunk_size = max(1, chunk_size)
+    return [
+        search_results[i : i + chunk_size]
+        for i in range(0, len(search_results), chunk_size)
+    ]
+
+
+async def condense_search_results(
+    query: str, search_results: list[str], config: ResearchConfig
+) -> tuple[list[str], int]:
+    """
+    Condense search results for the writer when they are too large.
+
+    Below ``config.map_reduce_token_threshold`` the results are returned as-is.
+    Above it, the results are chunked and each chunk is condensed in parallel
+    by the cheaper condenser agent, so the final writer pass only sees the
+    condensed notes. A chunk whose condensation fails is passed through
+    unchanged.
+
+    Returns the writer input and the number of chunks that were condensed.
+    """
+    threshold = config.map_reduce_token_threshold
+    if threshold is None or estimate_tokens(str(search_results)) <= threshold:
+        return search_results, 0
+
+    chunks = chunk_search_results(search_results, config.map_reduce_chunk_size)
+    workflow.logger.info(
+        f"Search results exceed ~{threshold} tokens, condensing {len(chunks)} chunks"
+    )
+    outputs = await asyncio.gather(
+        *(
+            condenser_agent.run(f"Original query: {query}\nSearch results: {chunk}")
+            for chunk in chunks
+        ),
+        return_exceptions=True,
+    )
+
+    condensed: list[str] = []
+    for chunk, output in zip(chunks, outputs):
+        if isinstance(output, BaseException):
+            workflow.logger.warning(f"Condensing search results failed: {output}")
+            condensed.extend(chunk)
+        else:
+            condensed.append(output.output)
+    return condensed, len(chunks)
+
+
+def assemble_report(outline: ReportOutline, sections: list[str]) -> str:
+    """Join the outline title and the written sections into one markdown report"""
+    parts = [f"# {outline.title}"]
+    for section, body in zip(outline.sections, sections):
+        parts.append(f"## {section.heading}\n\n{body.strip()}")
+    return "\n\n".join(parts) + "\n"
+
+
+async def write_sectioned_report(
+    query: str, search_results: list[str]
+) -> tuple[ReportData, int]:
+    """
+    Write a report as an outline followed by concurrently written sections.
+
+    One writer call produces the outline, every section is then written as its
+    own agent run in parallel, and the report is assembled in outline order.
+    The short summary and follow-up questions are derived from the assembled
+    report at the end.
+
+    Returns the report and the number of sections written.
+    """
+    research_str = (
+        f"Original query: {query}\nSummarized search results: {search_results}"
+    )
+
+    outline_result = await outline_agent.run(research_str)
+    outline = outline_result.output
+    workflow.logger.info(f"Writing {len(outline.sections)} report sections in parallel")
+
+    outline_str = "\n".join(f"- {section.heading}" for section in outline.sections)
+    section_results = await asyncio.gather(
+        *(
+            section_agent.run(
+                f"{research_str}\n\nReport outline:\n{outline_str}\n\n"
+                f"Section to write: {section.heading}\nSection brief: {section.brief}"
+            )
+            for section in outline.sections
+        )
+    )
+    markdown_report = assemble_report(
+        outline, [result.output for result in section_results]
+    )
+
+    summary_result = await summary_agent.run(markdown_report)
+    summary = summary_result.output
+    report = ReportData(
+        short_summary=summary.short_summary,
+        markdown_report=markdown_report,
+        follow_up_questions=summary.follow_up_questions,
+    )
+    return report, len(outline.sections)
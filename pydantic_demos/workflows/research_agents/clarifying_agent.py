@@ -1,6 +1,14 @@
 from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
+
+from pydantic_demos.workflows.local_agent_runner import LocalAgentRunner
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
 
 
 class Clarifications(BaseModel):
@@ -31,10 +39,11 @@ Focus on gathering the most important context that will significantly improve th
 
 
 agent = Agent(
-    "gpt-4o-mini",
+    ManagedModel(openai_model("gpt-4o-mini")),
     instructions=CLARIFYING_AGENT_PROMPT,
     name="clarifying-agent",
     output_type=Clarifications,
 )
 
 temporal_agent = TemporalAgent(agent)
+local_runner = LocalAgentRunner(temporal_agent)
@@ -0,0 +1,26 @@
+from pydantic_ai import Agent
+from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
+
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
+
+INSTRUCTIONS = (
+    "You are a research assistant preparing notes for a report writer. You will be given the "
+    "original research query and a batch of search result summaries. Condense them into dense "
+    "bullet-point notes that keep every fact, figure, name, date and source-specific detail that is "
+    "relevant to the query. Merge overlapping points, drop repetition and filler, and do not add any "
+    "information that is not in the summaries. Keep the notes under 300 words."
+)
+
+
+agent = Agent(
+    ManagedModel(openai_model("gpt-4o-mini")),
+    instructions=INSTRUCTIONS,
+    name="condenser-agent",
+)
+
+temporal_agent = TemporalAgent(agent)
@@ -1,13 +1,19 @@
 from pydantic import BaseModel
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
 
+from pydantic_demos.workflows.managed_model import ManagedModel
 from pydantic_demos.workflows.pdf_generation_activity import (
     PDFGenerationResult,
     StylingOptions,
     generate_pdf,
 )
 
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
+
 
 class PDFReportData(BaseModel):
     """Result from PDF generation"""
@@ -45,7 +51,7 @@ tool response in your output. Set success to true and include the file path retu
 
 
 agent = Agent(
-    "gpt-4o-mini",
+    ManagedModel(openai_model("gpt-4o-mini")),
     instructions=PDF_GENERATION_PROMPT,
     name="pdf-generator-agent",
     output_type=PDFReportData,
@@ -1,6 +1,13 @@
 from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
+
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
 
 PROMPT = (
     "You are a helpful research assistant. Given a query, come up with a set of web searches "
@@ -22,7 +29,7 @@ class WebSearchPlan(BaseModel):
 
 
 agent = Agent(
-    "gpt-4o",
+    ManagedModel(openai_model("gpt-4o")),
     instructions=PROMPT,
     name="planner-agent",
     output_type=WebSearchPlan,
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -31,6 +31,78 @@ class ResearchStatusInput(BaseModel):
     pass
 
 
+class ResearchConfig(BaseModel):
+    """Tuning options for the research pipeline"""
+
+    search_dedup_threshold: float = 0.75
+    """Similarity (0-1) at which planned search terms are merged; above 1 disables merging"""
+
+    max_concurrent_searches: int = 5
+    """Maximum number of searches a single workflow runs at the same time"""
+
+    search_cascade: bool = False
+    """Summarize searches with a cheap model first, escalating to the search agent's model on validation failures"""
+
+    search_quorum: float = 1.0
+    """Fraction of planned searches (0-1] that must finish before the report is written"""
+
+    search_deadline_seconds: float | None = None
+    """Write the report after this many seconds of searching even without a quorum"""
+
+    map_reduce_token_threshold: int | None = 6000
+    """Estimated search result tokens above which results are condensed before writing"""
+
+    map_reduce_chunk_size: int = 5
+    """Number of search results condensed together in one map-reduce chunk"""
+
+    sectioned_report: bool = False
+    """Write the report as an outline plus sections generated concurrently"""
+
+    stream_report: bool = False
+    """Signal the partial report to the workflow while it is written, for clients that display it"""
+
+    pdf_generation_mode: Literal["direct", "agent"] = "direct"
+    """Render PDFs directly with the generate_pdf activity, or let the PDF agent pick styling"""
+
+    speculative_planning: bool = False
+    """Plan searches while triage runs, discarding the plan if clarifications are needed"""
+
+    speculative_search: bool = False
+    """Plan and search the original query while clarifying questions are being answered"""
+
+    local_activity_agents: list[str] = ["triage-agent", "clarifying-agent"]
+    """Agents run as a single local activity, falling back to regular activities on failure"""
+
+    local_agent_timeout_seconds: float = 10.0
+    """Timeout for an agent run as a local activity before falling back"""
+
+    continue_as_new_history_length: int | None = 5000
+    """Idle interactive sessions continue as new once their history has this many events"""
+
+    continue_as_new_history_bytes: int | None = 8 * 1024 * 1024
+    """Idle interactive sessions continue as new once their history reaches this size"""
+
+
+@dataclass
+class ResearchMetrics:
+    """Counters describing how a research run used its searches"""
+
+    searches_planned: int = 0
+    searches_completed: int = 0
+    searches_used: int = 0
+    searches_cancelled: int = 0
+    condensed_chunks: int = 0
+    report_sections: int = 0
+    speculative_plans_used: int = 0
+    speculative_plans_wasted: int = 0
+    speculative_planning_seconds_saved: float = 0.0
+    pre_searches_completed: int = 0
+    pre_searches_reused: int = 0
+    tasks_cancelled: int = 0
+    cascade_searches: int = 0
+    cascade_escalations: int = 0
+
+
 @dataclass
 class ResearchInteraction:
     """Represents a research interaction with clarifications"""
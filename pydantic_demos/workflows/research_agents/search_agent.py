@@ -1,5 +1,20 @@
+from datetime import timedelta
+
 from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.workflow import ActivityConfig
+
+from pydantic_demos.workflows.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from pydantic_demos.workflows.circuit_breaker import CircuitOpenError
+from pydantic_demos.workflows.hedging import HedgingPolicy
+from pydantic_demos.workflows.inline_tools import inline_tool_activity_config
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
 
 INSTRUCTIONS = (
     "You are a research assistant. Given a search term, you search the web for that term and "
@@ -26,11 +41,53 @@ async def web_search(query: str) -> str:
     return f"Search results for '{query}': Found relevant information about {query}, including key details, statistics, and current information. Multiple sources confirm important aspects related to the query."
 
 
+# Shared by every search on the worker, adapting to rate limits and latency
+search_model_limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=32)
+# A few slow summaries set the latency of the whole search fan-out
+search_hedging_policy = HedgingPolicy(percentile=0.95, budget_ratio=0.05)
+# Search summaries are short; one this slow means the model is degraded
+SEARCH_LATENCY_SLO_SECONDS = 30.0
+
 agent = Agent(
-    "gpt-4o",
+    ManagedModel(
+        openai_model("gpt-4o"),
+        limiter=search_model_limiter,
+        hedging=search_hedging_policy,
+        # Searches keep flowing on the smaller model while gpt-4o is degraded
+        fallback=ManagedModel(
+            openai_model("gpt-4o-mini"), latency_slo_seconds=SEARCH_LATENCY_SLO_SECONDS
+        ),
+        latency_slo_seconds=SEARCH_LATENCY_SLO_SECONDS,
+    ),
     instructions=INSTRUCTIONS,
     name="search-agent",
     tools=[web_search],
 )
 
-temporal_agent = TemporalAgent(agent)
+# The mock web_search is deterministic, so it runs in the workflow; a real search
+# API client does I/O and must run as an activity again
+temporal_agent = TemporalAgent(
+    agent, tool_activity_config=inline_tool_activity_config(web_search)
+)
+
+# Cheap first attempt of a search cascade, escalated to the agent above when its
+# summary fails validation (see search_cascade.py)
+fast_agent = Agent(
+    ManagedModel(openai_model("gpt-4o-mini")),
+    instructions=INSTRUCTIONS,
+    name="search-fast-agent",
+    tools=[web_search],
+)
+
+# Retrying the cheap model for long only delays the escalation, so a failed,
+# slow or circuit-broken fast search gives up quickly and the cascade escalates
+fast_temporal_agent = TemporalAgent(
+    fast_agent,
+    activity_config=ActivityConfig(
+        start_to_close_timeout=timedelta(seconds=20),
+        retry_policy=RetryPolicy(
+            maximum_attempts=2, non_retryable_error_types=[CircuitOpenError.__name__]
+        ),
+    ),
+    tool_activity_config=inline_tool_activity_config(web_search),
+)
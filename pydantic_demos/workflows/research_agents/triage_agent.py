@@ -1,6 +1,15 @@
 from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
+
+from pydantic_demos.workflows.hedging import HedgingPolicy
+from pydantic_demos.workflows.local_agent_runner import LocalAgentRunner
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
 
 
 class TriageResult(BaseModel):
@@ -45,11 +54,19 @@ Provide clear reasoning for your decision in the reasoning field.
 """
 
 
+# Triage blocks the first clarifying question, so its slow tail is hedged
+triage_hedging_policy = HedgingPolicy(percentile=0.95, budget_ratio=0.05)
+
 agent = Agent(
-    "gpt-4o-mini",
+    ManagedModel(
+        openai_model("gpt-4o-mini"),
+        hedging=triage_hedging_policy,
+        latency_slo_seconds=30.0,
+    ),
     instructions=TRIAGE_AGENT_PROMPT,
     name="triage-agent",
     output_type=TriageResult,
 )
 
 temporal_agent = TemporalAgent(agent)
+local_runner = LocalAgentRunner(temporal_agent)
@@ -1,6 +1,14 @@
 from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
+from temporalio import workflow
+
+from pydantic_demos.workflows.managed_model import ManagedModel
+from pydantic_demos.workflows.report_streaming import stream_report_progress
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
 
 PROMPT = (
     "You are a senior researcher tasked with writing a comprehensive, in-depth report for a research query. "
@@ -32,11 +40,95 @@ class ReportData(BaseModel):
     """Suggested topics to research further"""
 
 
+OUTLINE_PROMPT = (
+    "You are a senior researcher planning a comprehensive, in-depth report for a research query. "
+    "You will be provided with the original query, and some initial research done by a research "
+    "assistant.\n"
+    "Produce a title and a detailed outline of 4-8 sections that together cover the report from "
+    "introduction to conclusions. For each section give a heading and a brief describing what the "
+    "section must cover and which findings from the research it should draw on. Sections will be "
+    "written independently, so the briefs must not overlap."
+)
+
+SECTION_PROMPT = (
+    "You are a senior researcher writing one section of a comprehensive research report. "
+    "You will be provided with the original query, the initial research, the report outline and "
+    "the section you are responsible for.\n"
+    "Write only that section in markdown, without repeating its heading. Write substantively: "
+    "expand on key points with detailed explanations, specific examples, data points and analysis. "
+    "Aim for 200-400 words. Use ### subheadings where useful. Do not cover material that belongs to "
+    "other sections of the outline."
+)
+
+SUMMARY_PROMPT = (
+    "You will be given a finished research report. Write a short 2-3 sentence summary of its "
+    "findings and suggest 3-5 follow-up questions or topics to research further."
+)
+
+
+class ReportSection(BaseModel):
+    heading: str
+    """The section heading"""
+
+    brief: str
+    """What the section must cover and which findings it should draw on"""
+
+
+class ReportOutline(BaseModel):
+    title: str
+    """The report title"""
+
+    sections: list[ReportSection]
+    """The report sections in reading order"""
+
+
+class ReportSummary(BaseModel):
+    short_summary: str
+    """A short 2-3 sentence summary of the findings."""
+
+    follow_up_questions: list[str]
+    """Suggested topics to research further"""
+
+
 agent = Agent(
-    "o3-mini",
+    ManagedModel(openai_model("o3-mini")),
     instructions=PROMPT,
     name="writer-agent",
     output_type=ReportData,
 )
 
+# Used when ResearchConfig.stream_report is set: pushes the partial markdown
+# report to the workflow while it is generated
+streaming_agent = Agent(
+    ManagedModel(openai_model("o3-mini")),
+    instructions=PROMPT,
+    name="writer-streaming-agent",
+    output_type=ReportData,
+    event_stream_handler=stream_report_progress,
+)
+
+outline_agent = Agent(
+    ManagedModel(openai_model("o3-mini")),
+    instructions=OUTLINE_PROMPT,
+    name="writer-outline-agent",
+    output_type=ReportOutline,
+)
+
+section_agent = Agent(
+    ManagedModel(openai_model("o3-mini")),
+    instructions=SECTION_PROMPT,
+    name="writer-section-agent",
+)
+
+summary_agent = Agent(
+    ManagedModel(openai_model("gpt-4o-mini")),
+    instructions=SUMMARY_PROMPT,
+    name="writer-summary-agent",
+    output_type=ReportSummary,
+)
+
 temporal_agent = TemporalAgent(agent)
+streaming_temporal_agent = TemporalAgent(streaming_agent)
+outline_temporal_agent = TemporalAgent(outline_agent)
+section_temporal_agent = TemporalAgent(section_agent)
+summary_temporal_agent = TemporalAgent(summary_agent)
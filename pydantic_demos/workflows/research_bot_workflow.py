@@ -1,7 +1,17 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from temporalio import workflow
 
+from pydantic_demos.workflows.report_streaming import (
+    ReportChunk,
+    ReportProgress,
+    ReportStreamBuffer,
+)
+from pydantic_demos.workflows.research_agents.research_models import (
+    ResearchConfig,
+    ResearchMetrics,
+)
+from pydantic_demos.workflows.research_agents.writer_agent import ReportData
 from pydantic_demos.workflows.simple_research_manager import (
     PydanticSimpleResearchManager,
 )
@@ -14,20 +24,57 @@ class ResearchWorkflowResult:
     short_summary: str
     markdown_report: str
     follow_up_questions: list[str]
+    metrics: ResearchMetrics = field(default_factory=ResearchMetrics)
 
 
 @workflow.defn
 class PydanticResearchWorkflow:
+    @workflow.init
+    def __init__(self, query: str, config: ResearchConfig | None = None) -> None:
+        self.manager = PydanticSimpleResearchManager(config)
+        self.report_stream = ReportStreamBuffer()
+        self.report_written = False
+
     @workflow.run
-    async def run(self, query: str) -> ResearchWorkflowResult:
-        manager = PydanticSimpleResearchManager()
-        # Get the full report data
-        search_plan = await manager._plan_searches(query)
-        search_results = await manager._perform_searches(search_plan)
-        report_data = await manager._write_report(query, search_results)
+    async def run(
+        self, query: str, config: ResearchConfig | None = None
+    ) -> ResearchWorkflowResult:
+        # Get the full report data; None if the workflow was ended meanwhile
+        report_data = await self.manager.tasks.run(self._research(query))
+        self.report_written = True
 
+        if report_data is None:
+            return ResearchWorkflowResult(
+                short_summary="Research ended by user",
+                markdown_report="Research workflow ended by user",
+                follow_up_questions=[],
+                metrics=self.manager.metrics,
+            )
         return ResearchWorkflowResult(
             short_summary=report_data.short_summary,
             markdown_report=report_data.markdown_report,
             follow_up_questions=report_data.follow_up_questions,
+            metrics=self.manager.metrics,
         )
+
+    async def _research(self, query: str) -> ReportData:
+        search_plan = await self.manager._plan_searches(query)
+        search_results = await self.manager._perform_searches(search_plan)
+        return await self.manager._write_report(query, search_results)
+
+    @workflow.signal
+    def report_progress(self, chunk: ReportChunk) -> None:
+        """Receive partial report markdown from the writer activity"""
+        self.report_stream.apply(chunk)
+
+    @workflow.query
+    def get_report_progress(self, cursor: int = 0) -> ReportProgress:
+        """Get the report text generated so far, starting at ``cursor``"""
+        return self.report_stream.read(cursor, done=self.report_written)
+
+    @workflow.signal
+    def end_workflow_signal(self) -> None:
+        """Signal to end the workflow, cancelling any research still in progress"""
+        cancelled = self.manager.cancel_outstanding()
+        if cancelled:
+            workflow.logger.info(f"Cancelled {cancelled} in-flight research tasks")
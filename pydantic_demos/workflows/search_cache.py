@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from temporalio import activity, workflow
+
+SEARCH_CACHE_ACTIVITY_TIMEOUT = timedelta(seconds=90)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search term so trivially different spellings share a cache key"""
+    return " ".join(re.findall(r"[a-z0-9]+", query.lower()))
+
+
+@dataclass
+class SearchCacheLookup:
+    """Result of looking up a search term in the worker-wide cache"""
+
+    hit: bool
+    result: str | None = None
+
+
+@dataclass
+class SearchCacheStats:
+    """Counters describing how much work the search cache saved"""
+
+    hits: int = 0
+    disk_hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def saved_searches(self) -> int:
+        """Search agent runs avoided through cache hits and coalesced waits"""
+        return self.hits + self.coalesced
+
+
+class SearchResultCache:
+    """
+    Worker-wide LRU + TTL cache for search agent results.
+
+    The cache is exposed to workflows as two local activities so every workflow
+    on the worker shares it. Claims and entries live in this process's memory,
+    and local activities run in the process executing the workflow, so a
+    workflow's lookup and store always reach the same cache. A miss claims the
+    search term; concurrent lookups of the same term wait for the claiming
+    workflow to store its result instead of running their own search. Entries
+    can optionally be persisted to SQLite, which also shares them between
+    worker processes and survives restarts; SQLite calls run in a thread so
+    they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 900.0,
+        sqlite_path: str | None = None,
+        coalesce_timeout_seconds: float = 60.0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self.coalesce_timeout_seconds = coalesce_timeout_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[str, tuple[float, asyncio.Future[str | None]]] = {}
+        self._db: Any = None
+        self._db_lock = threading.Lock()
+        self._stats = SearchCacheStats()
+
+    def stats(self) -> SearchCacheStats:
+        """Snapshot of the cache counters"""
+        return replace(self._stats, entries=len(self._entries))
+
+    @activity.defn(name="lookup_search_result")
+    async def lookup(self, query: str) -> SearchCacheLookup:
+        """Return a cached result, waiting for an identical in-flight search if any"""
+        key = normalize_query(query)
+        result = await self._get(key)
+        if result is not None:
+            self._stats.hits += 1
+            return SearchCacheLookup(hit=True, result=result)
+
+        now = time.time()
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[0] > now:
+            deadline, future = in_flight
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(future), timeout=deadline - now
+                )
+            except asyncio.TimeoutError:
+                result = None
+            if result is not None:
+                self._stats.coalesced += 1
+                return SearchCacheLookup(hit=True, result=result)
+        else:
+            # Claim the search term so concurrent lookups wait for this search
+            self._in_flight[key] = (
+                now + self.coalesce_timeout_seconds,
+                asyncio.get_running_loop().create_future(),
+            )
+
+        self._stats.misses += 1
+        return SearchCacheLookup(hit=False)
+
+    @activity.defn(name="store_search_result")
+    async def store(self, query: str, result: str | None) -> None:
+        """Store a search result and release any workflows waiting on it"""
+        key = normalize_query(query)
+        if result is not None:
+            self._put(key, result, time.time() + self.ttl_seconds)
+            self._stats.stores += 1
+
+        in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None and not in_flight[1].done():
+            in_flight[1].set_result(result)
+
+        if result is not None and self.sqlite_path:
+            await asyncio.to_thread(self._disk_put, key, result)
+
+    async def _get(self, key: str) -> str | None:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                return result
+            del self._entries[key]
+
+        if not self.sqlite_path:
+            return None
+        disk_entry = await asyncio.to_thread(self._disk_get, key, now)
+        if disk_entry is None:
+            return None
+        expires_at, result = disk_entry
+        self._stats.disk_hits += 1
+        self._put(key, result, expires_at)
+        return result
+
+    def _put(self, key: str, result: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _connect(self) -> Any:
+        if self._db is None and self.sqlite_path:
+            import sqlite3
+
+            # Used from worker threads, one at a time under _db_lock
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_results "
+                "(key TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> tuple[float, str] | None:
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT expires_at, result FROM search_results WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _disk_put(self, key: str, result: str) -> None:
+        with self._db_lock:
+            db = self._connect()
+            if db is None:
+                return
+            now = time.time()
+            db.execute("DELETE FROM search_results WHERE expires_at <= ?", (now,))
+            db.execute(
+                "INSERT OR REPLACE INTO search_results (key, result, expires_at) VALUES (?, ?, ?)",
+                (key, result, now + self.ttl_seconds),
+            )
+            db.commit()
+
+
+async def run_cached_search(
+    query: str, search: Callable[[], Awaitable[str | None]]
+) -> tuple[str | None, bool]:
+    """
+    Run a search through the worker-wide cache from workflow code.
+
+    Returns the search result and whether it was served from the cache.
+    """
+    # Local activities, so the lookup and the store run on this worker process
+    lookup = await workflow.execute_local_activity_method(
+        SearchResultCache.lookup,
+        query,
+        start_to_close_timeout=SEARCH_CACHE_ACTIVITY_TIMEOUT,
+    )
+    if lookup.hit:
+        return lookup.result, True
+
+    result: str | None = None
+    try:
+        result = await search()
+    finally:
+        # Always release the claim, even on failure, so waiters stop waiting
+        await workflow.execute_local_activity_method(
+            SearchResultCache.store,
+            args=[query, result],
+            start_to_close_timeout=SEARCH_CACHE_ACTIVITY_TIMEOUT,
+        )
+    return result, False
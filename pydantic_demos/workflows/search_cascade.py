@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from temporalio import workflow
+
+from pydantic_demos.workflows.research_agents.search_agent import (
+    fast_temporal_agent as fast_search_agent,
+)
+from pydantic_demos.workflows.research_agents.search_agent import (
+    temporal_agent as search_agent,
+)
+from pydantic_demos.workflows.research_agents.search_agent import web_search
+
+MAX_SUMMARY_WORDS = 250
+
+
+def search_summary_problem(result: AgentRunResult[str]) -> str | None:
+    """Why a search summary is not good enough to use, or None if it is"""
+    if not result.output.strip():
+        return "empty summary"
+    words = len(result.output.split())
+    if words > MAX_SUMMARY_WORDS:
+        return f"summary has {words} words"
+    searched = any(
+        isinstance(part, ToolCallPart) and part.tool_name == web_search.__name__
+        for message in result.new_messages()
+        if isinstance(message, ModelResponse)
+        for part in message.parts
+    )
+    if not searched:
+        return f"{web_search.__name__} was not called"
+    return None
+
+
+async def run_search_cascade(prompt: str) -> tuple[str, bool]:
+    """
+    Summarize a search with the fast search agent, escalating when needed.
+
+    The cheap model handles most search terms well. Its summary is only
+    replaced by one from the regular search agent when it fails validation
+    or the fast run fails. Returns the summary and whether it was escalated.
+    """
+    try:
+        result = await fast_search_agent.run(prompt)
+        problem = search_summary_problem(result)
+    except Exception as e:
+        problem = f"fast search failed: {e}"
+    else:
+        if problem is None:
+            return result.output, False
+
+    workflow.logger.info(f"Escalating search to {search_agent.name}: {problem}")
+    result = await search_agent.run(prompt)
+    return result.output, True
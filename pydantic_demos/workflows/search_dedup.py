@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import re
+
+from pydantic_demos.workflows.research_agents.planner_agent import (
+    WebSearchItem,
+    WebSearchPlan,
+)
+
+_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "at",
+        "by",
+        "for",
+        "from",
+        "in",
+        "is",
+        "of",
+        "on",
+        "or",
+        "the",
+        "to",
+        "vs",
+        "what",
+        "with",
+    }
+)
+
+_SUFFIXES = ("ing", "es", "ed", "s")
+
+
+def _stem(token: str) -> str:
+    """Strip common English suffixes so 'surfing' and 'surf' compare equal"""
+    for suffix in _SUFFIXES:
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def _tokens(query: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", query.lower())
+
+
+def query_shingles(query: str) -> frozenset[str]:
+    """Order-independent token shingles for a search term"""
+    return frozenset(
+        _stem(token) for token in _tokens(query) if token not in _STOPWORDS
+    )
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+def _similarity(
+    a: str, a_shingles: frozenset[str], b: str, b_shingles: frozenset[str]
+) -> float:
+    # Terms made only of stopwords have no shingles, so they are only the
+    # same search when their normalized text is identical
+    if not a_shingles and not b_shingles:
+        return 1.0 if _tokens(a) == _tokens(b) else 0.0
+    return _jaccard(a_shingles, b_shingles)
+
+
+def query_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of two search terms' shingles"""
+    return _similarity(a, query_shingles(a), b, query_shingles(b))
+
+
+def dedupe_search_plan(
+    search_plan: WebSearchPlan, threshold: float
+) -> tuple[WebSearchPlan, int]:
+    """
+    Merge near-identical search terms in a plan.
+
+    Terms are clustered greedily in plan order: each term joins the first
+    earlier cluster whose representative is at least ``threshold`` similar,
+    otherwise it starts a new cluster. The representative keeps its query and
+    the reasons of every merged term are combined. Similarity is computed
+    exactly rather than with MinHash signatures because plans are small and
+    workflow code must not depend on per-process hash seeds.
+
+    Returns the deduplicated plan and the number of searches pruned.
+    """
+    clusters: list[tuple[frozenset[str], WebSearchItem, list[str]]] = []
+    for item in search_plan.searches:
+        shingles = query_shingles(item.query)
+        for cluster_shingles, cluster_item, reasons in clusters:
+            similarity = _similarity(
+                item.query, shingles, cluster_item.query, cluster_shingles
+            )
+            if similarity >= threshold:
+                if item.reason not in reasons:
+                    reasons.append(item.reason)
+                break
+        else:
+            clusters.append((shingles, item, [item.reason]))
+
+    searches = [
+        WebSearchItem(query=item.query, reason="; ".join(reasons))
+        for _, item, reasons in clusters
+    ]
+    pruned = len(search_plan.searches) - len(searches)
+    return WebSearchPlan(searches=searches), pruned
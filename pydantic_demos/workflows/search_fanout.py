@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Callable
+
+from temporalio import workflow
+
+
+@dataclass
+class SearchFanoutResult:
+    """Search results gathered before the quorum or deadline was reached"""
+
+    results: list[str]
+    completed: int
+    cancelled: int
+
+
+async def collect_search_results(
+    tasks: list[asyncio.Task[str | None]],
+    quorum: float = 1.0,
+    deadline_seconds: float | None = None,
+    on_complete: Callable[[int], None] | None = None,
+) -> SearchFanoutResult:
+    """
+    Collect search results until enough searches are back or time runs out.
+
+    Waits until ``quorum`` (a fraction of ``tasks``) have completed or
+    ``deadline_seconds`` have passed, whichever comes first, then cancels the
+    stragglers so their activities stop. Results are kept in plan order so the
+    writer input does not depend on completion order.
+    """
+    required = min(len(tasks), max(1, math.ceil(quorum * len(tasks))))
+    deadline = (
+        workflow.time() + deadline_seconds if deadline_seconds is not None else None
+    )
+
+    pending = set(tasks)
+    completed = 0
+    while pending and completed < required:
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - workflow.time()
+            if timeout <= 0:
+                break
+        done, pending = await workflow.wait(
+            pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
+            break
+        completed += len(done)
+        if on_complete is not None:
+            on_complete(completed)
+
+    # Cancel in plan order; set iteration order is not stable across replays
+    for task in tasks:
+        if task in pending:
+            task.cancel()
+
+    results = [
+        result
+        for task in tasks
+        if task not in pending and (result := task.result()) is not None
+    ]
+    return SearchFanoutResult(
+        results=results, completed=completed, cancelled=len(pending)
+    )
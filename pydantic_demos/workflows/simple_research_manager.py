@@ -4,6 +4,10 @@ import asyncio
 
 from temporalio import workflow
 
+from pydantic_demos.workflows.report_writing import (
+    condense_search_results,
+    write_sectioned_report,
+)
 from pydantic_demos.workflows.research_agents.planner_agent import (
     WebSearchItem,
     WebSearchPlan,
@@ -11,20 +15,45 @@ from pydantic_demos.workflows.research_agents.planner_agent import (
 from pydantic_demos.workflows.research_agents.planner_agent import (
     temporal_agent as planner_temporal_agent,
 )
+from pydantic_demos.workflows.research_agents.research_models import (
+    ResearchConfig,
+    ResearchMetrics,
+)
 from pydantic_demos.workflows.research_agents.search_agent import (
     temporal_agent as search_temporal_agent,
 )
 from pydantic_demos.workflows.research_agents.writer_agent import ReportData
+from pydantic_demos.workflows.research_agents.writer_agent import (
+    streaming_temporal_agent as writer_streaming_temporal_agent,
+)
 from pydantic_demos.workflows.research_agents.writer_agent import (
     temporal_agent as writer_temporal_agent,
 )
+from pydantic_demos.workflows.search_cache import run_cached_search
+from pydantic_demos.workflows.search_cascade import run_search_cascade
+from pydantic_demos.workflows.search_dedup import dedupe_search_plan
+from pydantic_demos.workflows.search_fanout import collect_search_results
+from pydantic_demos.workflows.task_tracker import TaskTracker
 
 
 class PydanticSimpleResearchManager:
-    def __init__(self):
+    def __init__(self, config: ResearchConfig | None = None):
+        self.config = config or ResearchConfig()
+        self.metrics = ResearchMetrics()
+        self.tasks = TaskTracker()
         self.search_agent = search_temporal_agent
         self.planner_agent = planner_temporal_agent
-        self.writer_agent = writer_temporal_agent
+        self.writer_agent = (
+            writer_streaming_temporal_agent
+            if self.config.stream_report
+            else writer_temporal_agent
+        )
+
+    def cancel_outstanding(self) -> int:
+        """Cancel all in-flight research work, e.g. when the workflow is ended"""
+        cancelled = self.tasks.cancel_all()
+        self.metrics.tasks_cancelled += cancelled
+        return cancelled
 
     async def run(self, query: str) -> str:
         search_plan = await self._plan_searches(query)
@@ -37,27 +66,69 @@ class PydanticSimpleResearchManager:
         return result.output
 
     async def _perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
-        num_completed = 0
+        search_plan = self._dedupe_searches(search_plan)
+        # Bound in-flight searches; results still stream back in completion order
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_searches)
         tasks = [
-            asyncio.create_task(self._search(item)) for item in search_plan.searches
+            self.tasks.create_task(self._bounded_search(item, semaphore))
+            for item in search_plan.searches
         ]
-        results = []
-        for task in workflow.as_completed(tasks):
-            result = await task
-            if result is not None:
-                results.append(result)
-            num_completed += 1
-        return results
+        fanout = await collect_search_results(
+            tasks,
+            quorum=self.config.search_quorum,
+            deadline_seconds=self.config.search_deadline_seconds,
+        )
+        self.metrics.searches_planned += len(tasks)
+        self.metrics.searches_completed += fanout.completed
+        self.metrics.searches_used += len(fanout.results)
+        self.metrics.searches_cancelled += fanout.cancelled
+        return fanout.results
+
+    def _dedupe_searches(self, search_plan: WebSearchPlan) -> WebSearchPlan:
+        deduped_plan, pruned = dedupe_search_plan(
+            search_plan, self.config.search_dedup_threshold
+        )
+        workflow.logger.info(
+            f"Pruned {pruned} near-duplicate searches, {len(deduped_plan.searches)} remaining"
+        )
+        return deduped_plan
+
+    async def _bounded_search(
+        self, item: WebSearchItem, semaphore: asyncio.Semaphore
+    ) -> str | None:
+        async with semaphore:
+            return await self._search(item)
 
     async def _search(self, item: WebSearchItem) -> str | None:
+        result, _ = await run_cached_search(
+            item.query, lambda: self._run_search_agent(item)
+        )
+        return result
+
+    async def _run_search_agent(self, item: WebSearchItem) -> str | None:
         input_str = f"Search term: {item.query}\nReason for searching: {item.reason}"
         try:
+            if self.config.search_cascade:
+                output, escalated = await run_search_cascade(input_str)
+                self.metrics.cascade_searches += 1
+                self.metrics.cascade_escalations += escalated
+                return output
             result = await self.search_agent.run(input_str)
             return str(result.output)
         except Exception:
             return None
 
     async def _write_report(self, query: str, search_results: list[str]) -> ReportData:
+        search_results, condensed_chunks = await condense_search_results(
+            query, search_results, self.config
+        )
+        self.metrics.condensed_chunks += condensed_chunks
+
+        if self.config.sectioned_report:
+            report, num_sections = await write_sectioned_report(query, search_results)
+            self.metrics.report_sections += num_sections
+            return report
+
         input_str = (
             f"Original query: {query}\nSummarized search results: {search_results}"
         )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+# The tracker whose task the current code runs in, inherited by subtasks
+_current_tracker: ContextVar[TaskTracker | None] = ContextVar(
+    "current_tracker", default=None
+)
+
+
+class TaskTracker:
+    """
+    Keeps track of the tasks a research manager starts so they can be cancelled together.
+
+    Cancelling a task that awaits an activity or agent run cancels that
+    activity, so ``cancel_all`` stops every outstanding search, writer run or
+    PDF render of the workflow. Tasks started from inside another tracked task
+    are cancelled too, but only the outermost ones are counted.
+    """
+
+    def __init__(self) -> None:
+        # A list rather than a set so cancellation order is deterministic
+        self._tasks: list[asyncio.Task[Any]] = []
+        self._nested: set[asyncio.Task[Any]] = set()
+        self.cancelled = False
+
+    def create_task(self, coro: Coroutine[Any, Any, T]) -> asyncio.Task[T]:
+        nested = _current_tracker.get() is self
+        # The task copies the current context, so it and its subtasks see this
+        token = _current_tracker.set(self)
+        try:
+            task = asyncio.create_task(coro)
+        finally:
+            _current_tracker.reset(token)
+        self._tasks.append(task)
+        task.add_done_callback(self._forget)
+        if nested:
+            self._nested.add(task)
+        return task
+
+    def _forget(self, task: asyncio.Task[Any]) -> None:
+        self._tasks.remove(task)
+        self._nested.discard(task)
+
+    async def run(self, coro: Coroutine[Any, Any, T]) -> T | None:
+        """Run ``coro`` as a tracked task, returning None if ``cancel_all`` stopped it"""
+        task = self.create_task(coro)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self.cancelled and task.cancelled():
+                return None
+            raise
+
+    def cancel_all(self) -> int:
+        """Cancel all outstanding tasks and return how many top-level tasks were cancelled"""
+        self.cancelled = True
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        return sum(1 for task in pending if task not in self._nested)
@@ -6,6 +6,13 @@ from pydantic_ai import Agent
 from pydantic_ai.durable_exec.temporal import TemporalAgent
 from temporalio import workflow
 
+from pydantic_demos.workflows.inline_tools import inline_tool_activity_config
+from pydantic_demos.workflows.managed_model import ManagedModel
+
+# Passed through so workflow sandboxes reuse the worker's provider and pool
+with workflow.unsafe.imports_passed_through():
+    from pydantic_demos.workflows.model_provider import openai_model
+
 
 @dataclass
 class Weather:
@@ -22,13 +29,16 @@ async def get_weather(city: str) -> Weather:
 
 
 agent = Agent(
-    "gpt-4",
+    ManagedModel(openai_model("gpt-4")),
     instructions="You are a helpful agent.",
     name="tools-agent",
     tools=[get_weather],
 )
 
-temporal_agent = TemporalAgent(agent)
+# get_weather is cheap and deterministic, so it runs in the workflow, not an activity
+temporal_agent = TemporalAgent(
+    agent, tool_activity_config=inline_tool_activity_config(get_weather)
+)
 
 
 @workflow.defn
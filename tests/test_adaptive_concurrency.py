@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from pydantic_demos.workflows import adaptive_concurrency
+from pydantic_demos.workflows.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(adaptive_concurrency.time, "monotonic", fake.monotonic)
+    return fake
+
+
+async def request(
+    limiter: AdaptiveConcurrencyLimiter,
+    clock: FakeClock,
+    latency: float = 0.0,
+    error: Exception | None = None,
+) -> None:
+    async with limiter.slot():
+        clock.now += latency
+        if error is not None:
+            raise error
+
+
+@pytest.mark.asyncio
+async def test_fast_successes_grow_limit_up_to_max(clock: FakeClock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+    # Roughly one extra slot per window of ``limit`` fast requests
+    for _ in range(3):
+        await request(limiter, clock, latency=1.0)
+    assert limiter.limit == 3
+    for _ in range(3):
+        await request(limiter, clock, latency=1.0)
+    assert limiter.limit == 4
+
+    for _ in range(20):
+        await request(limiter, clock, latency=1.0)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_halves_limit_down_to_min(clock: FakeClock):
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, min_limit=2, cooldown_seconds=2.0
+    )
+
+    with pytest.raises(RateLimited):
+        await request(limiter, clock, error=RateLimited())
+    assert limiter.limit == 4
+
+    # Errors from the same overload episode only back off once
+    with pytest.raises(RateLimited):
+        await request(limiter, clock, error=RateLimited())
+    assert limiter.limit == 4
+
+    for _ in range(3):
+        clock.now += 2.0
+        with pytest.raises(RateLimited):
+            await request(limiter, clock, error=RateLimited())
+    assert limiter.limit == 2
+    assert limiter.stats().throttled == 5
+    assert limiter.stats().decreases == 4
+
+
+@pytest.mark.asyncio
+async def test_other_errors_keep_limit(clock: FakeClock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+
+    with pytest.raises(ValueError):
+        await request(limiter, clock, error=ValueError())
+    assert limiter.limit == 8
+
+
+@pytest.mark.asyncio
+async def test_slow_response_halves_limit(clock: FakeClock):
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, min_limit=3, latency_target_seconds=10.0
+    )
+
+    await request(limiter, clock, latency=11.0)
+    assert limiter.limit == 4
+    await request(limiter, clock, latency=11.0)
+    assert limiter.limit == 3
+    assert limiter.stats().slow == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_admitted_in_order_when_limit_grows(clock: FakeClock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=4)
+    release = asyncio.Event()
+    admitted: list[int] = []
+
+    async def hold(i: int) -> None:
+        async with limiter.slot():
+            admitted.append(i)
+            await release.wait()
+
+    holder = asyncio.create_task(hold(0))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(hold(i)) for i in range(1, 4)]
+    await asyncio.sleep(0)
+    assert admitted == [0]
+    assert limiter.stats().waiting == 3
+
+    # Grow the limit so that all waiters fit once the holder finishes
+    limiter._limit = 4.0
+    release.set()
+    await asyncio.gather(holder, *waiters)
+
+    assert admitted == [0, 1, 2, 3]
+    assert limiter.stats().in_flight == 0
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from pydantic_demos.workflows import circuit_breaker
+from pydantic_demos.workflows.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+)
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake.monotonic)
+    return fake
+
+
+async def succeed(
+    breaker: CircuitBreaker,
+    clock: FakeClock,
+    seconds: float = 0.0,
+    latency_threshold_seconds: float | None = None,
+) -> None:
+    async with breaker.track(latency_threshold_seconds):
+        clock.now += seconds
+
+
+async def fail(breaker: CircuitBreaker, status_code: int = 500) -> None:
+    with pytest.raises(ProviderError):
+        async with breaker.track():
+            raise ProviderError(status_code)
+
+
+@pytest.mark.asyncio
+async def test_opens_once_error_threshold_reached(clock: FakeClock):
+    breaker = CircuitBreaker("model", window=10, min_requests=4)
+    await succeed(breaker, clock)
+    await succeed(breaker, clock)
+    await fail(breaker)
+    assert breaker.state is CircuitState.CLOSED
+
+    await fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await succeed(breaker, clock)
+    assert breaker.stats().rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_count(clock: FakeClock):
+    breaker = CircuitBreaker("model", min_requests=2)
+    for _ in range(5):
+        await fail(breaker, status_code=400)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.stats().failures == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_count_only_with_a_threshold(clock: FakeClock):
+    breaker = CircuitBreaker("model", min_requests=2)
+    await succeed(breaker, clock, seconds=120)
+    await succeed(breaker, clock, seconds=120)
+    assert breaker.state is CircuitState.CLOSED
+
+    await succeed(breaker, clock, seconds=31, latency_threshold_seconds=30)
+    await succeed(breaker, clock, seconds=31, latency_threshold_seconds=30)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.stats().slow == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_probes_close_the_breaker(clock: FakeClock):
+    breaker = CircuitBreaker(
+        "model", min_requests=1, open_seconds=30, half_open_probes=2
+    )
+    await fail(breaker)
+    assert breaker.rejects_requests()
+
+    clock.now += 30
+    assert not breaker.rejects_requests()
+    await succeed(breaker, clock)
+    assert breaker.state is CircuitState.HALF_OPEN
+    await succeed(breaker, clock)
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_the_breaker(clock: FakeClock):
+    breaker = CircuitBreaker("model", min_requests=1, open_seconds=30)
+    await fail(breaker)
+    clock.now += 30
+
+    await fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.rejects_requests()
+    assert breaker.stats().times_opened == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_limited_probes(clock: FakeClock):
+    breaker = CircuitBreaker(
+        "model", min_requests=1, open_seconds=30, half_open_probes=1
+    )
+    await fail(breaker)
+    clock.now += 30
+
+    release = asyncio.Event()
+
+    async def probe() -> None:
+        async with breaker.track():
+            await release.wait()
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    assert breaker.rejects_requests()
+    release.set()
+    await task
+    assert breaker.state is CircuitState.CLOSED
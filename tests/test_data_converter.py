@@ -0,0 +1,93 @@
+import gc
+import weakref
+
+from pydantic import BaseModel, Field
+from temporalio.converter import DataConverter
+from temporalio.worker.workflow_sandbox import SandboxRestrictions
+from temporalio.worker.workflow_sandbox._importer import Importer
+from temporalio.worker.workflow_sandbox._restrictions import RestrictionContext
+
+from pydantic_demos.data_converter import (
+    FastPydanticPayloadConverter,
+    _type_adapter,
+    _type_adapters,
+    _type_key,
+)
+from pydantic_demos.workflows.research_agents.research_models import ResearchConfig
+
+
+class AliasedModel(BaseModel):
+    report_title: str = Field(alias="reportTitle")
+    word_count: int = Field(alias="wordCount")
+
+
+def test_aliased_model_round_trip():
+    converter = FastPydanticPayloadConverter()
+    model = AliasedModel(reportTitle="Findings", wordCount=120)
+
+    payloads = converter.to_payloads([model])
+    assert payloads[0].data == b'{"reportTitle":"Findings","wordCount":120}'
+    assert converter.from_payloads(payloads, [AliasedModel]) == [model]
+
+
+def test_aliased_models_in_containers_round_trip():
+    converter = FastPydanticPayloadConverter()
+    models = [AliasedModel(reportTitle="A", wordCount=1)]
+
+    payloads = converter.to_payloads([models])
+    assert converter.from_payloads(payloads, [list[AliasedModel]]) == [models]
+
+
+def test_matches_default_pydantic_converter_output():
+    from temporalio.contrib.pydantic import pydantic_data_converter
+
+    model = AliasedModel(reportTitle="Findings", wordCount=120)
+    default_payload = pydantic_data_converter.payload_converter.to_payloads([model])
+    assert FastPydanticPayloadConverter().to_payloads([model]) == default_payload
+
+
+def test_data_converter_uses_fast_converter():
+    converter = DataConverter(payload_converter_class=FastPydanticPayloadConverter)
+    assert isinstance(converter.payload_converter, FastPydanticPayloadConverter)
+
+
+def _sandbox_research_config() -> type:
+    """Import ResearchConfig the way the workflow sandbox does for each run"""
+    importer = Importer(SandboxRestrictions.default, RestrictionContext())
+    with importer.applied():
+        from pydantic_demos.workflows.research_agents import research_models
+
+        return research_models.ResearchConfig
+
+
+def test_sandbox_reimported_types_decode_to_their_own_class():
+    converter = FastPydanticPayloadConverter()
+    payloads = converter.to_payloads([ResearchConfig(search_cascade=True)])
+
+    first_run = _sandbox_research_config()
+    second_run = _sandbox_research_config()
+    assert first_run is not second_run
+
+    for config_type in (first_run, second_run, ResearchConfig):
+        (decoded,) = converter.from_payloads(payloads, [config_type])
+        assert type(decoded) is config_type
+        assert decoded.search_cascade
+
+    key = _type_key(ResearchConfig)
+    assert key == _type_key(first_run)
+    assert _type_adapters[key][0] is ResearchConfig
+    assert _type_adapter(ResearchConfig) is _type_adapters[key][1]
+
+
+def test_sandbox_reimport_releases_previous_run_type():
+    converter = FastPydanticPayloadConverter()
+    payloads = converter.to_payloads([ResearchConfig()])
+
+    first_run = _sandbox_research_config()
+    converter.from_payloads(payloads, [first_run])
+    first_run_ref = weakref.ref(first_run)
+    del first_run
+
+    converter.from_payloads(payloads, [_sandbox_research_config()])
+    gc.collect()
+    assert first_run_ref() is None
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from pydantic_demos.workflows.hedging import HedgingPolicy
+
+
+def warmed_up(latencies: list[float], **kwargs) -> HedgingPolicy:
+    policy = HedgingPolicy(min_samples=len(latencies), **kwargs)
+    policy._latencies.extend(latencies)
+    return policy
+
+
+def test_no_delay_until_enough_samples():
+    policy = HedgingPolicy(min_samples=3)
+    policy._latencies.extend([1.0, 2.0])
+    assert policy.hedge_delay() is None
+
+
+def test_delay_is_latency_percentile():
+    policy = warmed_up([float(i) for i in range(1, 101)], percentile=0.95)
+    assert policy.hedge_delay() == 95.0
+
+
+def test_delay_has_a_floor():
+    policy = warmed_up([0.01] * 20, min_delay_seconds=0.5)
+    assert policy.hedge_delay() == 0.5
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_hedge_wins():
+    policy = warmed_up([0.01] * 20, min_delay_seconds=0.01, budget_ratio=1.0)
+    calls = 0
+
+    async def send() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+            return "primary"
+        return "hedge"
+
+    assert await policy.run(send) == "hedge"
+    stats = policy.stats()
+    assert (stats.requests, stats.hedged, stats.hedge_wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_beat_slow_success():
+    policy = warmed_up([0.01] * 20, min_delay_seconds=0.01, budget_ratio=1.0)
+    calls = 0
+
+    async def send() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        raise RuntimeError("hedge failed")
+
+    assert await policy.run(send) == "primary"
+    assert policy.stats().hedge_wins == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_limited_by_budget():
+    policy = warmed_up(
+        [0.01] * 100, percentile=0.5, min_delay_seconds=0.01, budget_ratio=0.5
+    )
+
+    async def send() -> str:
+        await asyncio.sleep(0.03)
+        return "ok"
+
+    for _ in range(4):
+        assert await policy.run(send) == "ok"
+
+    stats = policy.stats()
+    assert stats.hedged == 2
+    assert stats.budget_exhausted == 2
+    assert stats.hedged <= policy.budget_ratio * stats.requests
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged():
+    policy = warmed_up([1.0] * 20)
+
+    async def send() -> str:
+        return "ok"
+
+    assert await policy.run(send) == "ok"
+    assert policy.stats().hedged == 0
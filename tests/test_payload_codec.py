@@ -0,0 +1,89 @@
+import os
+import time
+import zlib
+
+import pytest
+from temporalio.api.common.v1 import Payload
+
+from pydantic_demos.data_converter import (
+    BLOB_REF_ENCODING,
+    ZLIB_ENCODING,
+    PayloadOffloadCodec,
+)
+
+
+def make_payload(data: bytes) -> Payload:
+    return Payload(metadata={"encoding": b"json/plain"}, data=data)
+
+
+@pytest.mark.asyncio
+async def test_round_trips_inline_compressed_and_offloaded_payloads(tmp_path):
+    codec = PayloadOffloadCodec(
+        blob_dir=tmp_path, offload_threshold=4096, compress_threshold=256
+    )
+    payloads = [
+        make_payload(b'"small"'),
+        make_payload(b'"' + b"a" * 1000 + b'"'),
+        make_payload(os.urandom(8192)),
+    ]
+
+    encoded = await codec.encode(payloads)
+    assert encoded[0] == payloads[0]
+    assert encoded[1].metadata["encoding"] == ZLIB_ENCODING
+    assert encoded[2].metadata["encoding"] == BLOB_REF_ENCODING
+    assert len(encoded[2].data) == 64
+
+    assert await codec.decode(encoded) == payloads
+
+
+@pytest.mark.asyncio
+async def test_detects_corrupt_blobs(tmp_path):
+    codec = PayloadOffloadCodec(blob_dir=tmp_path, offload_threshold=1024)
+    encoded = await codec.encode([make_payload(os.urandom(2048))])
+    blob_path = codec._blob_path(encoded[0].data.decode())
+    blob_path.write_bytes(zlib.compress(b"something else"))
+
+    with pytest.raises(ValueError, match="corrupt"):
+        await codec.decode(encoded)
+
+
+@pytest.mark.asyncio
+async def test_removes_only_expired_blobs(tmp_path):
+    codec = PayloadOffloadCodec(
+        blob_dir=tmp_path, offload_threshold=1024, blob_ttl_seconds=3600
+    )
+    payloads = [make_payload(os.urandom(2048)), make_payload(os.urandom(2048))]
+    old, recent = await codec.encode(payloads)
+    old_path = codec._blob_path(old.data.decode())
+    two_hours_ago = time.time() - 7200
+    os.utime(old_path, (two_hours_ago, two_hours_ago))
+
+    assert codec.remove_expired_blobs() == 1
+    assert not old_path.exists()
+    assert await codec.decode([recent]) == payloads[1:]
+
+
+@pytest.mark.asyncio
+async def test_reading_a_blob_keeps_it(tmp_path):
+    codec = PayloadOffloadCodec(
+        blob_dir=tmp_path, offload_threshold=1024, blob_ttl_seconds=3600
+    )
+    payload = make_payload(os.urandom(2048))
+    encoded = await codec.encode([payload])
+    path = codec._blob_path(encoded[0].data.decode())
+    two_hours_ago = time.time() - 7200
+    os.utime(path, (two_hours_ago, two_hours_ago))
+
+    assert await codec.decode(encoded) == [payload]
+    assert codec.remove_expired_blobs() == 0
+
+
+def test_without_ttl_keeps_blobs(tmp_path):
+    codec = PayloadOffloadCodec(blob_dir=tmp_path, blob_ttl_seconds=None)
+    (tmp_path / "ab").mkdir()
+    blob = tmp_path / "ab" / "abcdef"
+    blob.write_bytes(b"")
+    os.utime(blob, (0, 0))
+
+    assert codec.remove_expired_blobs() == 0
+    assert blob.exists()
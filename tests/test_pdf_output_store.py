@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+from pydantic_demos.workflows.pdf_output_store import PdfOutputStore
+
+
+def render(store: PdfOutputStore, key: str, content: bytes) -> Path:
+    temp_path = store.temp_path(key)
+    temp_path.write_bytes(content)
+    return store.commit(temp_path, key)
+
+
+def test_key_depends_only_on_render_inputs():
+    key = PdfOutputStore.key("# Report", "Title", {"font_size": 12, "theme": "a"})
+
+    assert key == PdfOutputStore.key(
+        "# Report", "Title", {"theme": "a", "font_size": 12}
+    )
+    assert key != PdfOutputStore.key("# Report", "Other title", None)
+    assert key != PdfOutputStore.key("# Other report", "Title", None)
+    assert key != PdfOutputStore.key("# Report", "Title", {"font_size": 13})
+
+
+def test_commit_moves_render_into_place(tmp_path):
+    store = PdfOutputStore(tmp_path)
+    key = store.key("# Report", "Title", None)
+    temp_path = store.temp_path(key)
+    temp_path.write_bytes(b"%PDF")
+
+    assert store.get(key) is None
+    path = store.commit(temp_path, key)
+
+    assert path == store.path_for(key)
+    assert path.read_bytes() == b"%PDF"
+    assert not temp_path.exists()
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+
+def test_get_returns_existing_render_and_marks_it_used(tmp_path):
+    store = PdfOutputStore(tmp_path)
+    key = store.key("# Report", "Title", None)
+    path = render(store, key, b"%PDF")
+    os.utime(path, (0, 0))
+
+    assert store.get(key) == path
+    assert path.stat().st_mtime > 0
+
+
+def test_evicts_least_recently_used_but_keeps_new_render(tmp_path):
+    store = PdfOutputStore(tmp_path, max_bytes=250)
+    old = render(store, "a" * 64, b"x" * 100)
+    recent = render(store, "b" * 64, b"x" * 100)
+    os.utime(old, (1, 1))
+    os.utime(recent, (2, 2))
+
+    # The new render is the oldest by mtime and still must not be evicted
+    temp_path = store.temp_path("c" * 64)
+    temp_path.write_bytes(b"x" * 100)
+    os.utime(temp_path, (0, 0))
+    new = store.commit(temp_path, "c" * 64)
+
+    assert not old.exists()
+    assert recent.exists()
+    assert new.exists()
+
+
+def test_evict_keeps_file_larger_than_store(tmp_path):
+    store = PdfOutputStore(tmp_path, max_bytes=50)
+    existing = render(store, "a" * 64, b"x" * 40)
+    new = render(store, "b" * 64, b"x" * 100)
+
+    assert not existing.exists()
+    assert new.exists()
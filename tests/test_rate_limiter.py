@@ -0,0 +1,102 @@
+import pytest
+
+from pydantic_demos.workflows import rate_limiter
+from pydantic_demos.workflows.rate_limiter import (
+    ModelRateLimit,
+    SharedRateLimiter,
+    parse_rate_limits,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "time", fake.time)
+    return fake
+
+
+def make_limiter(tmp_path, **limits: ModelRateLimit) -> SharedRateLimiter:
+    return SharedRateLimiter(str(tmp_path / "rate-limits.sqlite"), limits)
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("gpt-4o=500:30000, o3-mini=:200000,") == {
+        "gpt-4o": ModelRateLimit(requests_per_minute=500, tokens_per_minute=30000),
+        "o3-mini": ModelRateLimit(tokens_per_minute=200000),
+    }
+
+
+def test_request_bucket_refills_continuously(tmp_path, clock: FakeClock):
+    limit = ModelRateLimit(requests_per_minute=60)
+    limiter = make_limiter(tmp_path, model=limit)
+
+    for _ in range(60):
+        assert limiter._try_acquire("model", limit, 0) == 0
+    assert limiter._try_acquire("model", limit, 0) == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert limiter._try_acquire("model", limit, 0) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert limiter._try_acquire("model", limit, 0) == 0
+
+
+def test_token_bucket_waits_for_missing_tokens(tmp_path, clock: FakeClock):
+    limit = ModelRateLimit(tokens_per_minute=6000)
+    limiter = make_limiter(tmp_path, model=limit)
+
+    assert limiter._try_acquire("model", limit, 4800) == 0
+    # 1200 tokens left; 1800 more refill in 18 seconds
+    assert limiter._try_acquire("model", limit, 3000) == pytest.approx(18.0)
+    # Requests larger than the bucket wait for a full bucket, not forever
+    clock.now += 60
+    assert limiter._try_acquire("model", limit, 10000) == 0
+
+
+def test_refill_is_capped_at_one_minute(tmp_path, clock: FakeClock):
+    limit = ModelRateLimit(requests_per_minute=2)
+    limiter = make_limiter(tmp_path, model=limit)
+    clock.now += 3600
+
+    assert limiter._try_acquire("model", limit, 0) == 0
+    assert limiter._try_acquire("model", limit, 0) == 0
+    assert limiter._try_acquire("model", limit, 0) > 0
+
+
+def test_processes_share_one_budget(tmp_path, clock: FakeClock):
+    limit = ModelRateLimit(requests_per_minute=2)
+    first = make_limiter(tmp_path, model=limit)
+    second = make_limiter(tmp_path, model=limit)
+
+    assert first._try_acquire("model", limit, 0) == 0
+    assert second._try_acquire("model", limit, 0) == 0
+    assert first._try_acquire("model", limit, 0) == pytest.approx(30.0)
+
+
+@pytest.mark.asyncio
+async def test_usage_corrections_and_throttling(tmp_path, clock: FakeClock):
+    limit = ModelRateLimit(requests_per_minute=60, tokens_per_minute=6000)
+    limiter = make_limiter(tmp_path, model=limit)
+
+    await limiter.acquire("model", 6000)
+    # Only 1000 of the 6000 estimated tokens were used
+    await limiter.record_usage("model", 6000, 1000)
+    assert limiter._try_acquire("model", limit, 5000) == 0
+
+    await limiter.record_throttled("model")
+    assert limiter._try_acquire("model", limit, 0) == pytest.approx(1.0)
+    assert limiter.stats().throttled == 1
+
+
+@pytest.mark.asyncio
+async def test_models_without_limits_are_not_tracked(tmp_path):
+    limiter = make_limiter(tmp_path)
+    await limiter.acquire("model", 10**9)
+    assert limiter.stats().acquired == 0
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from pydantic_demos.workflows import search_cache
+from pydantic_demos.workflows.search_cache import (
+    SearchCacheLookup,
+    SearchResultCache,
+    normalize_query,
+)
+
+
+def test_normalize_query():
+    assert normalize_query("  Best SURF spots, 2024! ") == "best surf spots 2024"
+
+
+@pytest.mark.asyncio
+async def test_miss_claims_and_store_serves_hits():
+    cache = SearchResultCache()
+
+    assert await cache.lookup("surf spots") == SearchCacheLookup(hit=False)
+    await cache.store("surf spots", "result")
+
+    assert await cache.lookup("Surf  spots!") == SearchCacheLookup(
+        hit=True, result="result"
+    )
+    stats = cache.stats()
+    assert (stats.misses, stats.hits, stats.stores) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookup_waits_for_claiming_search():
+    cache = SearchResultCache()
+    assert not (await cache.lookup("surf spots")).hit
+
+    waiter = asyncio.create_task(cache.lookup("surf spots"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await cache.store("surf spots", "result")
+    assert await waiter == SearchCacheLookup(hit=True, result="result")
+    assert cache.stats().coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_search_releases_waiters_without_caching():
+    cache = SearchResultCache()
+    await cache.lookup("surf spots")
+    waiter = asyncio.create_task(cache.lookup("surf spots"))
+    await asyncio.sleep(0)
+
+    await cache.store("surf spots", None)
+    assert await waiter == SearchCacheLookup(hit=False)
+    assert cache.stats().entries == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_stop_waiting_when_the_claim_expires():
+    cache = SearchResultCache(coalesce_timeout_seconds=0.05)
+    await cache.lookup("surf spots")
+
+    assert await cache.lookup("surf spots") == SearchCacheLookup(hit=False)
+    # Once expired, the next lookup claims the term itself instead of waiting
+    assert await asyncio.wait_for(cache.lookup("surf spots"), timeout=0.01) == (
+        SearchCacheLookup(hit=False)
+    )
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr(search_cache.time, "time", lambda: now)
+    cache = SearchResultCache(ttl_seconds=60)
+    await cache.store("surf spots", "result")
+
+    now += 59
+    assert (await cache.lookup("surf spots")).hit
+    now += 1
+    assert not (await cache.lookup("surf spots")).hit
+    assert cache.stats().entries == 0
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_entries():
+    cache = SearchResultCache(max_entries=2)
+    await cache.store("a", "1")
+    await cache.store("b", "2")
+    await cache.lookup("a")
+    await cache.store("c", "3")
+
+    assert (await cache.lookup("a")).hit
+    assert not (await cache.lookup("b")).hit
+    assert cache.stats().evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_is_shared_between_caches(tmp_path):
+    path = str(tmp_path / "search-cache.sqlite")
+    await SearchResultCache(sqlite_path=path).store("surf spots", "result")
+
+    other_process = SearchResultCache(sqlite_path=path)
+    assert await other_process.lookup("surf spots") == SearchCacheLookup(
+        hit=True, result="result"
+    )
+    assert other_process.stats().disk_hits == 1
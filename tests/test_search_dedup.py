@@ -0,0 +1,57 @@
+from pydantic_demos.workflows.research_agents.planner_agent import (
+    WebSearchItem,
+    WebSearchPlan,
+)
+from pydantic_demos.workflows.search_dedup import dedupe_search_plan, query_similarity
+
+
+def plan(*queries: str) -> WebSearchPlan:
+    return WebSearchPlan(
+        searches=[
+            WebSearchItem(query=query, reason=f"reason {i}")
+            for i, query in enumerate(queries)
+        ]
+    )
+
+
+def test_similarity_ignores_order_stopwords_and_suffixes():
+    assert query_similarity("best surfing spots", "the spot for best surf") == 1.0
+    assert query_similarity("surf spots", "ski resorts") == 0.0
+
+
+def test_stopword_only_terms_match_only_identical_text():
+    assert query_similarity("what is the", "what is a") == 0.0
+    assert query_similarity("What is the?", "what is the") == 1.0
+
+    deduped, pruned = dedupe_search_plan(
+        plan("what is the", "what is a"), threshold=0.75
+    )
+    assert pruned == 0
+    assert len(deduped.searches) == 2
+
+
+def test_merges_near_duplicates_into_first_term():
+    deduped, pruned = dedupe_search_plan(
+        plan("best surf spots Portugal", "Portugal best surfing spots", "ski resorts"),
+        threshold=0.75,
+    )
+
+    assert pruned == 1
+    assert [item.query for item in deduped.searches] == [
+        "best surf spots Portugal",
+        "ski resorts",
+    ]
+    assert deduped.searches[0].reason == "reason 0; reason 1"
+
+
+def test_keeps_terms_below_threshold():
+    search_plan = plan("surf spots Portugal", "surf spots Spain")
+    deduped, pruned = dedupe_search_plan(search_plan, threshold=0.75)
+
+    assert pruned == 0
+    assert deduped == search_plan
+
+
+def test_threshold_above_one_disables_merging():
+    search_plan = plan("surf spots", "surf spots")
+    assert dedupe_search_plan(search_plan, threshold=1.1) == (search_plan, 0)
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from pydantic_demos.workflows.task_tracker import TaskTracker
+
+
+@pytest.mark.asyncio
+async def test_cancel_all_counts_only_top_level_tasks():
+    tracker = TaskTracker()
+    started = asyncio.Event()
+
+    async def search() -> None:
+        await asyncio.Event().wait()
+
+    async def research() -> None:
+        # Subtasks created directly and through gather are both nested
+        tracker.create_task(search())
+
+        async def start_search() -> None:
+            await tracker.create_task(search())
+
+        gathered = asyncio.gather(start_search(), start_search())
+        started.set()
+        await gathered
+
+    research_task = tracker.create_task(research())
+    await started.wait()
+    await asyncio.sleep(0)
+
+    assert tracker.cancel_all() == 1
+    await asyncio.gather(research_task, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert research_task.cancelled()
+    assert not tracker._tasks
+
+
+@pytest.mark.asyncio
+async def test_run_returns_none_when_cancelled():
+    tracker = TaskTracker()
+
+    async def wait_forever() -> str:
+        await asyncio.Event().wait()
+        return "done"
+
+    async def finish() -> str:
+        return "done"
+
+    assert await tracker.run(finish()) == "done"
+    run = asyncio.create_task(tracker.run(wait_forever()))
+    await asyncio.sleep(0)
+
+    assert tracker.cancel_all() == 1
+    assert await run is None